@@ -0,0 +1,113 @@
+"""Wallets-per-minute benchmark: blocking Web3 calls vs AsyncWeb3 inside coroutines.
+
+Starts a local mock JSON-RPC server with a fixed per-request latency and runs the
+same per-wallet read workload (native balance, Arcade balance, pending nonce)
+through the old synchronous client and the async client used by the scripts.
+
+    python -m benchmarks.bench_async_rpc --wallets 200 --concurrency 5 50 500
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from aiohttp import web
+from web3 import Web3, AsyncWeb3
+
+from scripts.arcade import check_balance, ARCADE_BANK_ADDRESS, NATIVE_TOKEN_ADDRESS, CONTRACT_ABI
+
+ONE_ETHER_HEX = hex(10 ** 18)
+RESULTS = {
+    "eth_chainId": hex(1270),
+    "eth_blockNumber": "0x1",
+    "eth_getBalance": ONE_ETHER_HEX,
+    "eth_call": "0x" + f"{10 ** 18:064x}",
+    "eth_getTransactionCount": "0x0",
+    "eth_gasPrice": hex(10 ** 9),
+}
+
+
+def start_mock_rpc(latency: float, port: int = 0):
+    """Run the mock RPC in its own thread so blocking clients cannot stall it."""
+    ready = threading.Event()
+    state = {}
+
+    async def handle(request):
+        body = await request.json()
+        await asyncio.sleep(latency)
+        calls = body if isinstance(body, list) else [body]
+        replies = [{"jsonrpc": "2.0", "id": c["id"], "result": RESULTS.get(c["method"], "0x0")} for c in calls]
+        return web.json_response(replies if isinstance(body, list) else replies[0])
+
+    async def serve():
+        app = web.Application()
+        app.router.add_post("/", handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", port)
+        await site.start()
+        state["url"] = f"http://127.0.0.1:{runner.addresses[0][1]}/"
+        ready.set()
+        await asyncio.Event().wait()
+
+    threading.Thread(target=lambda: asyncio.run(serve()), daemon=True).start()
+    ready.wait()
+    return state["url"]
+
+
+def wallet_addresses(count: int):
+    return [Web3.to_checksum_address(f"0x{i + 1:040x}") for i in range(count)]
+
+
+async def run_blocking(url: str, addresses, concurrency: int) -> float:
+    w3 = Web3(Web3.HTTPProvider(url))
+    contract = w3.eth.contract(address=ARCADE_BANK_ADDRESS, abi=CONTRACT_ABI)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def wallet(address):
+        async with semaphore:
+            w3.eth.get_balance(address)
+            contract.functions.getUserBalance(address).call()
+            w3.eth.get_transaction_count(address, 'pending')
+
+    start = time.perf_counter()
+    await asyncio.gather(*(wallet(a) for a in addresses))
+    return time.perf_counter() - start
+
+
+async def run_async(url: str, addresses, concurrency: int) -> float:
+    w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(url))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def wallet(address):
+        async with semaphore:
+            await check_balance(w3, address, NATIVE_TOKEN_ADDRESS, 18, 'en')
+            await check_balance(w3, address, ARCADE_BANK_ADDRESS, 18, 'en')
+            await w3.eth.get_transaction_count(address, 'pending')
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(wallet(a) for a in addresses))
+        return time.perf_counter() - start
+    finally:
+        await w3.provider.disconnect()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--wallets", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[5, 50, 500])
+    parser.add_argument("--latency", type=float, default=0.05, help="mock RPC latency in seconds")
+    args = parser.parse_args()
+
+    url = start_mock_rpc(args.latency)
+    addresses = wallet_addresses(args.wallets)
+    print(f"{'concurrency':>11} | {'blocking w/min':>14} | {'async w/min':>11} | {'speedup':>7}")
+    for concurrency in args.concurrency:
+        before = await run_blocking(url, addresses, concurrency)
+        after = await run_async(url, addresses, concurrency)
+        print(f"{concurrency:>11} | {len(addresses) / before * 60:>14.0f} | {len(addresses) / after * 60:>11.0f} | {before / after:>6.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+"""Handshakes and request latency per game: one ClientSession per request vs SessionPool.
+
+Starts a local HTTPS mock of the play.irys.xyz API (self-signed certificate
+created with the `openssl` CLI) and plays N games per wallet, each game being
+the IP check + /game/start + /game/complete requests the arcade scripts send.
+
+    python -m benchmarks.bench_session_pool --wallets 20 --games 5
+"""
+import argparse
+import asyncio
+import os
+import ssl
+import subprocess
+import tempfile
+import time
+
+from aiohttp import ClientSession, TCPConnector, TraceConfig, web
+
+from irys.sessions import SessionPool, percentile
+
+
+def make_certificate(directory: str):
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", key, "-out", cert,
+         "-days", "1", "-subj", "/CN=127.0.0.1"],
+        check=True, capture_output=True,
+    )
+    return cert, key
+
+
+async def start_mock_api(cert: str, key: str, latency: float):
+    async def ip(request):
+        await asyncio.sleep(latency)
+        return web.json_response({"ip": "127.0.0.1"})
+
+    async def game(request):
+        await request.read()
+        await asyncio.sleep(latency)
+        return web.json_response({"success": True, "message": "ok", "data": {"transactionHash": "0x0"}})
+
+    app = web.Application()
+    app.router.add_get("/ip", ip)
+    app.router.add_post("/api/game/start", game)
+    app.router.add_post("/api/game/complete", game)
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0, ssl_context=context).start()
+    return runner, f"https://127.0.0.1:{runner.addresses[0][1]}"
+
+
+async def play_fresh_sessions(base: str, wallets: int, games: int):
+    stats = {"handshakes": 0, "latencies": []}
+    trace = TraceConfig()
+
+    async def on_connection_create_end(session, ctx, params):
+        stats["handshakes"] += 1
+
+    trace.on_connection_create_end.append(on_connection_create_end)
+
+    async def request(method, url):
+        started = time.perf_counter()
+        async with ClientSession(connector=TCPConnector(ssl=False), trace_configs=[trace]) as session:
+            async with session.request(method, url, json={}) as response:
+                await response.read()
+        stats["latencies"].append(time.perf_counter() - started)
+
+    async def wallet():
+        for _ in range(games):
+            await request("GET", f"{base}/ip")
+            await request("POST", f"{base}/api/game/start")
+            await request("POST", f"{base}/api/game/complete")
+
+    await asyncio.gather(*(wallet() for _ in range(wallets)))
+    return stats["handshakes"], stats["latencies"]
+
+
+async def play_session_pool(base: str, wallets: int, games: int):
+    latencies = []
+
+    async with SessionPool(ssl=False) as pool:
+        async def request(method, url):
+            started = time.perf_counter()
+            async with pool.get(None).request(method, url, json={}) as response:
+                await response.read()
+            latencies.append(time.perf_counter() - started)
+
+        async def wallet():
+            for _ in range(games):
+                await request("GET", f"{base}/ip")
+                await request("POST", f"{base}/api/game/start")
+                await request("POST", f"{base}/api/game/complete")
+
+        await asyncio.gather(*(wallet() for _ in range(wallets)))
+        return pool.handshakes, latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--wallets", type=int, default=20)
+    parser.add_argument("--games", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02, help="mock API latency in seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        runner, base = await start_mock_api(*make_certificate(directory), args.latency)
+        try:
+            total_games = args.wallets * args.games
+            print(f"{'client':<14} | {'handshakes/game':>15} | {'p50 ms':>8} | {'p95 ms':>8}")
+            for name, play in (("fresh session", play_fresh_sessions), ("session pool", play_session_pool)):
+                handshakes, latencies = await play(base, args.wallets, args.games)
+                print(f"{name:<14} | {handshakes / total_games:>15.2f} | {percentile(latencies, 0.5) * 1000:>8.1f} | {percentile(latencies, 0.95) * 1000:>8.1f}")
+        finally:
+            await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,205 @@
+import asyncio
+import time
+from typing import AsyncContextManager, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from eth_abi import encode
+from eth_utils import function_signature_to_4byte_selector, to_hex
+
+from irys.loader import chunked
+from irys.multicall import Multicall
+from irys.rpc import BATCH_SIZE, RPCError, batch_request, endpoint_of
+from irys.wallets import Wallet
+
+GET_USER_BALANCE_SELECTOR = function_signature_to_4byte_selector("getUserBalance(address)")
+WEI_PER_ETHER = 10 ** 18
+NATIVE = 'native'
+ARCADE = 'arcade'
+
+
+def encode_get_user_balance(address: str) -> bytes:
+    return GET_USER_BALANCE_SELECTOR + encode(['address'], [address])
+
+
+def _to_ether(value) -> float:
+    # Same convention as check_balance: -1 when the balance cannot be read
+    if isinstance(value, bytes):
+        return int.from_bytes(value[:32], 'big') / WEI_PER_ETHER if value else -1
+    if not isinstance(value, str):
+        return -1
+    return int(value, 16) / WEI_PER_ETHER if value not in ('0x', '') else 0.0
+
+
+async def _batched_snapshot(w3, addresses: Sequence[str], bank_address: str, chunk_size: int) -> List[Tuple[float, float]]:
+    calls = []
+    for address in addresses:
+        calls.append(("eth_getBalance", [address, "latest"]))
+        calls.append(("eth_call", [{"to": bank_address, "data": to_hex(encode_get_user_balance(address))}, "latest"]))
+
+    results = await batch_request(endpoint_of(w3), calls, chunk_size)
+    return [(_to_ether(results[i]), _to_ether(results[i + 1])) for i in range(0, len(results), 2)]
+
+
+async def fetch_balance_snapshot(w3, addresses: Sequence[str], bank_address: str,
+                                 chunk_size: int = BATCH_SIZE, multicall: Optional[Multicall] = None) -> List[Tuple[float, float]]:
+    """Native and Arcade balances for every address, in the order given.
+
+    Reads are packed into Multicall3 `aggregate3` calls when the aggregator is
+    deployed, otherwise sent as chunked JSON-RPC batches, so a few thousand
+    wallets cost a handful of HTTP requests instead of two each.
+    """
+    multicall = multicall or Multicall(w3)
+    if not await multicall.is_available():
+        return await _batched_snapshot(w3, addresses, bank_address, chunk_size)
+
+    calls = []
+    for address in addresses:
+        calls.append(multicall.get_eth_balance_call(address))
+        calls.append((bank_address, encode_get_user_balance(address)))
+
+    results = await multicall.aggregate(calls)
+    return [(_to_ether(results[i]), _to_ether(results[i + 1])) for i in range(0, len(results), 2)]
+
+
+async def iter_balance_chunks(w3, wallets: Iterable[Wallet], bank_address: str,
+                              chunk_size: int = BATCH_SIZE) -> AsyncIterator[List[Tuple[Wallet, Tuple[float, float]]]]:
+    """(wallet, (native, Arcade)) pairs, a chunk of wallets at a time.
+
+    Each chunk's balances are fetched only when the chunk is asked for, so
+    the first wallets can start before the rest of the file has been read.
+    """
+    multicall = Multicall(w3)
+    for chunk in chunked(wallets, chunk_size):
+        snapshot = await fetch_balance_snapshot(w3, [wallet.address for wallet in chunk], bank_address, multicall=multicall)
+        yield list(zip(chunk, snapshot))
+
+
+class BalanceReader:
+    """Coalesces the balance reads of concurrent wallets into shared calls.
+
+    Reads asked for within `window` seconds of each other (up to `max_batch`)
+    go out together: as Multicall3 `aggregate3` calls when the aggregator is
+    deployed, otherwise as one JSON-RPC batch. Each batch runs inside
+    `slot()`, and a batch that could not be sent raises there and in every
+    waiting `native()`/`arcade()`, so the endpoint's limiter sees RPC
+    failures instead of a -1 balance.
+    """
+
+    def __init__(self, w3, bank_address: str, window: float = 0.05, max_batch: int = BATCH_SIZE,
+                 slot: Optional[Callable[[], AsyncContextManager]] = None, multicall: Optional[Multicall] = None):
+        self.url = endpoint_of(w3)
+        self.bank_address = bank_address
+        self.window = window
+        self.max_batch = max_batch
+        self.slot = slot
+        self.multicall = multicall or Multicall(w3)
+        self.batches = 0
+        self._queue: List[Tuple[str, str, asyncio.Future]] = []
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def native(self, address: str) -> float:
+        return await self._read(NATIVE, address)
+
+    async def arcade(self, address: str) -> float:
+        return await self._read(ARCADE, address)
+
+    async def _read(self, kind: str, address: str) -> float:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((kind, address, future))
+        if len(self._queue) >= self.max_batch:
+            self._flush()
+        elif self._handle is None:
+            self._handle = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        batch, self._queue = self._queue, []
+        if batch:
+            task = asyncio.ensure_future(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[Tuple[str, str, asyncio.Future]]):
+        self.batches += 1
+        try:
+            if self.slot is None:
+                values = await self._fetch(batch)
+            else:
+                async with self.slot():
+                    values = await self._fetch(batch)
+        except Exception as e:
+            values = [e] * len(batch)
+        for (_, _, future), value in zip(batch, values):
+            if future.done():
+                continue
+            if isinstance(value, Exception):
+                future.set_exception(value)
+            else:
+                future.set_result(value)
+
+    async def _fetch(self, batch: List[Tuple[str, str, asyncio.Future]]) -> List:
+        if await self.multicall.is_available():
+            replies = await self.multicall.aggregate([
+                self.multicall.get_eth_balance_call(address) if kind == NATIVE else (self.bank_address, encode_get_user_balance(address))
+                for kind, address, _ in batch
+            ])
+        else:
+            replies = await batch_request(self.url, [
+                ("eth_getBalance", [address, "latest"]) if kind == NATIVE
+                else ("eth_call", [{"to": self.bank_address, "data": to_hex(encode_get_user_balance(address))}, "latest"])
+                for kind, address, _ in batch
+            ])
+        for reply in replies:
+            if isinstance(reply, Exception) and not isinstance(reply, RPCError):
+                # The request itself failed: raise inside the slot
+                raise reply
+        return [
+            reply if isinstance(reply, RPCError)
+            else RPCError(-1, 'balance read reverted') if reply is None
+            else _to_ether(reply)
+            for reply in replies
+        ]
+
+
+class BalanceCache:
+    """Last known balance per address, shared by every coroutine of a run.
+
+    Seeded from a snapshot and kept current with local debits between reads,
+    so the check before each action does not cost an RPC call. Entries older
+    than `ttl` seconds are read again through the caller's `fetch`.
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self.hits = 0
+        self.reads = 0
+        self._entries: Dict[str, Tuple[float, float]] = {}
+
+    def set(self, address: str, balance: float):
+        if balance < 0:
+            # -1 means the read failed: forget the entry rather than trust it
+            self._entries.pop(address, None)
+            return
+        self._entries[address] = (balance, time.monotonic())
+
+    def seed(self, addresses: Sequence[str], balances: Sequence[float]):
+        for address, balance in zip(addresses, balances):
+            self.set(address, balance)
+
+    def debit(self, address: str, amount: float):
+        entry = self._entries.get(address)
+        if entry is not None:
+            self._entries[address] = (max(0.0, entry[0] - amount), entry[1])
+
+    async def get(self, address: str, fetch: Callable[[], Awaitable[float]]) -> float:
+        entry = self._entries.get(address)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl:
+            self.hits += 1
+            return entry[0]
+        self.reads += 1
+        balance = await fetch()
+        self.set(address, balance)
+        return balance
@@ -0,0 +1,127 @@
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from irys.retry import CIRCUIT_OPEN, NETWORK, RATE_LIMIT, SERVER, TIMEOUT, classify
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+# Error kinds that say the endpoint itself is unhealthy; 4xx answers do not
+FAILURE_KINDS = (NETWORK, TIMEOUT, RATE_LIMIT, SERVER)
+# How often a waiting caller looks again while another caller's probe is in flight
+PROBE_WAIT = 1.0
+
+
+class CircuitOpenError(Exception):
+    kind = CIRCUIT_OPEN
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"circuit for {name} is open, next probe in {retry_in:.0f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Stops sending to an endpoint after `failure_threshold` consecutive failures.
+
+    While open, requests fail immediately with CircuitOpenError, or wait
+    for the circuit when `guard()` is given a `sleep`. After `reset_timeout`
+    seconds one probe request is let through (half-open): success closes
+    the circuit, failure opens it for another period.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.transitions: List[Tuple[float, str, str]] = []
+        self._opened_at = 0.0
+        self._probing = False
+
+    def retry_in(self) -> float:
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def _transition(self, state: str):
+        self.transitions.append((time.time(), self.state, state))
+        self.state = state
+
+    def before_request(self):
+        if self.state == OPEN:
+            if self.retry_in() > 0:
+                raise CircuitOpenError(self.name, self.retry_in())
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probing:
+                raise CircuitOpenError(self.name, 0)
+            self._probing = True
+
+    def on_success(self):
+        self.failures = 0
+        self._probing = False
+        if self.state == HALF_OPEN:
+            self._transition(CLOSED)
+
+    def on_failure(self):
+        self._probing = False
+        self.failures += 1
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+            self._transition(OPEN)
+            self._opened_at = time.monotonic()
+            self.failures = 0
+
+    @asynccontextmanager
+    async def guard(self, sleep: Optional[Callable[[float], Awaitable]] = None):
+        """Count the request's outcome; with `sleep`, an open circuit is waited out instead of raised."""
+        while True:
+            try:
+                self.before_request()
+                break
+            except CircuitOpenError as e:
+                if sleep is None:
+                    raise
+                await sleep(e.retry_in or PROBE_WAIT)
+        try:
+            yield
+        except Exception as e:
+            if classify(e) in FAILURE_KINDS:
+                self.on_failure()
+            else:
+                self.on_success()
+            raise
+        except BaseException:
+            # Cancelled mid-request: says nothing about the endpoint
+            self._probing = False
+            raise
+        else:
+            self.on_success()
+
+
+class BreakerRegistry:
+    """One shared breaker per endpoint for every wallet of the process."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        if name not in self._breakers:
+            self._breakers[name] = CircuitBreaker(name, self.failure_threshold, self.reset_timeout)
+        return self._breakers[name]
+
+    def transitions(self, since: float = 0.0) -> List[Tuple[str, float, str, str]]:
+        """(endpoint, timestamp, from, to) for every state change after `since`, oldest first."""
+        changes = [
+            (breaker.name, at, old, new)
+            for breaker in self._breakers.values()
+            for at, old, new in breaker.transitions
+            if at >= since
+        ]
+        return sorted(changes, key=lambda change: change[1])
+
+
+breakers = BreakerRegistry()
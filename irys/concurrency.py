@@ -0,0 +1,118 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Iterable
+from aiohttp import ClientResponseError
+
+from irys.breaker import FAILURE_KINDS
+from irys.retry import classify
+from irys.scheduler import Slots
+from irys.sessions import percentile
+
+OVERLOAD_STATUSES = (429, 500, 502, 503, 504)
+
+
+def is_overload(error: BaseException) -> bool:
+    """Errors that mean "send less": rate limits, server errors and timeouts."""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return True
+    if isinstance(error, ClientResponseError):
+        return error.status in OVERLOAD_STATUSES
+    message = str(error).lower()
+    return 'too many requests' in message or 'timed out' in message or 'timeout' in message
+
+
+def is_failure(error: BaseException) -> bool:
+    """Errors that count against the endpoint; 4xx and revert answers mean it is working."""
+    return is_overload(error) or classify(error) in FAILURE_KINDS
+
+
+class AIMDLimiter:
+    """Concurrency limit for one endpoint, tuned by additive increase / multiplicative decrease.
+
+    Every `window` requests the limit grows by one if p95 latency stayed
+    under `target_latency` and the error rate under `max_error_rate`, and
+    shrinks by `backoff` otherwise. Only transport failures, timeouts, 429
+    and 5xx count as errors; a request rejected on its merits does not. An
+    overload error (429, 5xx, timeout) cuts the limit at once, at most once
+    per window so one burst of failures does not collapse it to the floor.
+    """
+
+    def __init__(self, name: str, initial: int, min_limit: int = 1, max_limit: int = 64,
+                 target_latency: float = 2.0, max_error_rate: float = 0.05, window: int = 20, backoff: float = 0.5):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.max_error_rate = max_error_rate
+        self.window = window
+        self.backoff = backoff
+        self.slots = Slots(max(min_limit, min(initial, max_limit)))
+        self.latencies = deque(maxlen=window)
+        self.errors = 0
+        self.requests = 0
+        self.decreases = 0
+        self._since_change = 0
+
+    @property
+    def limit(self) -> int:
+        return self.slots.capacity
+
+    @asynccontextmanager
+    async def request(self):
+        await self.slots.acquire()
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.record(time.perf_counter() - started, e)
+            raise
+        else:
+            self.record(time.perf_counter() - started)
+        finally:
+            self.slots.release()
+
+    def record(self, latency: float, error: BaseException = None):
+        self.requests += 1
+        self._since_change += 1
+        self.latencies.append(latency)
+        if error is not None and is_failure(error):
+            self.errors += 1
+            if is_overload(error) and self._since_change >= self.window // 2:
+                self._decrease()
+                return
+        if self._since_change < self.window:
+            return
+        error_rate = self.errors / self._since_change
+        if error_rate > self.max_error_rate or percentile(self.latencies, 0.95) > self.target_latency:
+            self._decrease()
+        elif self.limit < self.max_limit:
+            self._set(self.limit + 1)
+        else:
+            self._reset_window()
+
+    def _decrease(self):
+        self.decreases += 1
+        self._set(max(self.min_limit, int(self.limit * self.backoff)))
+
+    def _set(self, limit: int):
+        self.slots.resize(limit)
+        self._reset_window()
+
+    def _reset_window(self):
+        self.errors = 0
+        self._since_change = 0
+
+    def stats(self) -> dict:
+        return {
+            'endpoint': self.name,
+            'limit': self.limit,
+            'requests': self.requests,
+            'decreases': self.decreases,
+            'p95': percentile(self.latencies, 0.95),
+        }
+
+
+def adaptive_limits(endpoints: Iterable[str], initial: int, max_limit: int, **kwargs) -> Dict[str, AIMDLimiter]:
+    return {endpoint: AIMDLimiter(endpoint, initial, max_limit=max_limit, **kwargs) for endpoint in endpoints}
@@ -0,0 +1,113 @@
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+from aiohttp import ClientSession
+from eth_utils import to_bytes
+
+from irys.rpc import batch_request
+from irys.sessions import percentile
+
+DEFAULT_TTL = 2.0  # seconds, about one Irys testnet block
+GAS_LIMIT_SAMPLES = 3  # receipts needed before estimate_gas is skipped
+GAS_LIMIT_PERCENTILE = 0.95
+GAS_LIMIT_MARGIN = 1.2
+
+
+class GasOracle:
+    """Gas price suggestions shared by every wallet of a run.
+
+    One JSON-RPC batch (block, gas price, priority fee) is sent per block at
+    most: a suggestion is reused until it is `ttl` seconds old, and callers
+    that arrive while a refresh is running wait for it instead of starting
+    their own.
+    """
+
+    def __init__(self, url: str, ttl: float = DEFAULT_TTL, session: Optional[ClientSession] = None):
+        self.url = url
+        self.ttl = ttl
+        self.session = session
+        self.refreshes = 0
+        self._suggestion: Optional[dict] = None
+        self._fetched_at = 0.0
+        self._refresh: Optional[asyncio.Task] = None
+
+    async def suggest(self) -> dict:
+        """Latest suggestion: block, gasPrice, baseFeePerGas, maxPriorityFeePerGas, maxFeePerGas."""
+        if self._suggestion is not None and time.monotonic() - self._fetched_at < self.ttl:
+            return self._suggestion
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self._fetch())
+        return await asyncio.shield(self._refresh)
+
+    async def _fetch(self) -> dict:
+        block, gas_price, priority_fee = await batch_request(self.url, [
+            ('eth_getBlockByNumber', ['latest', False]),
+            ('eth_gasPrice', []),
+            ('eth_maxPriorityFeePerGas', []),
+        ], session=self.session)
+        if isinstance(gas_price, Exception):
+            raise gas_price
+        suggestion = {
+            'block': int(block['number'], 16) if isinstance(block, dict) else None,
+            'gasPrice': int(gas_price, 16),
+            'baseFeePerGas': None,
+            'maxPriorityFeePerGas': None,
+            'maxFeePerGas': None,
+        }
+        if isinstance(block, dict) and block.get('baseFeePerGas'):
+            base_fee = int(block['baseFeePerGas'], 16)
+            tip = int(priority_fee, 16) if isinstance(priority_fee, str) else max(0, suggestion['gasPrice'] - base_fee)
+            suggestion.update(baseFeePerGas=base_fee, maxPriorityFeePerGas=tip, maxFeePerGas=2 * base_fee + tip)
+        self._suggestion, self._fetched_at = suggestion, time.monotonic()
+        self.refreshes += 1
+        return suggestion
+
+    async def fee_fields(self, multiplier: float = 1.0, eip1559: bool = False) -> dict:
+        """Fee fields for a transaction dict, legacy gasPrice unless `eip1559` and the chain has a base fee."""
+        suggestion = await self.suggest()
+        if eip1559 and suggestion['maxFeePerGas'] is not None:
+            return {
+                'maxFeePerGas': int(suggestion['maxFeePerGas'] * multiplier),
+                'maxPriorityFeePerGas': int(suggestion['maxPriorityFeePerGas'] * multiplier),
+            }
+        return {'gasPrice': int(suggestion['gasPrice'] * multiplier)}
+
+
+class GasLimits:
+    """Gas limits learned from receipts instead of estimated per transaction.
+
+    Calls are grouped by (contract, selector, value bucket), where the bucket
+    is the bit length of the value sent. Once a group has a few receipts its
+    limit is the high percentile of gasUsed times a safety margin; until then,
+    or after a transaction of the group failed, the caller estimates again.
+    """
+
+    def __init__(self, samples: int = GAS_LIMIT_SAMPLES, fraction: float = GAS_LIMIT_PERCENTILE,
+                 margin: float = GAS_LIMIT_MARGIN):
+        self.samples = samples
+        self.fraction = fraction
+        self.margin = margin
+        self.hits = 0
+        self.misses = 0
+        self._used: Dict[Tuple[str, str, int], deque] = {}
+
+    @staticmethod
+    def key(to: str, data, value: int = 0) -> Tuple[str, str, int]:
+        selector = to_bytes(hexstr=data)[:4].hex() if isinstance(data, str) else bytes(data or b'')[:4].hex()
+        return to.lower(), selector, int(value).bit_length()
+
+    def limit(self, key: Tuple[str, str, int]) -> Optional[int]:
+        used = self._used.get(key)
+        if not used or len(used) < self.samples:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return int(percentile(used, self.fraction) * self.margin)
+
+    def record(self, key: Tuple[str, str, int], gas_used: int):
+        self._used.setdefault(key, deque(maxlen=100)).append(gas_used)
+
+    def forget(self, key: Tuple[str, str, int]):
+        """Drop what was learned, e.g. after a transaction ran out of gas."""
+        self._used.pop(key, None)
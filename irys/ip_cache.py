@@ -0,0 +1,92 @@
+import asyncio
+import json
+import os
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from aiohttp import ClientSession, ClientTimeout
+
+DEFAULT_TTL = 600  # seconds
+REFRESH_RATIO = 0.8  # refresh in background once an entry is this far into its TTL
+
+
+async def fetch_public_ip(session: ClientSession, url: str, headers: Optional[dict] = None, proxy: Optional[str] = None) -> str:
+    async with session.get(url, headers=headers, proxy=proxy, timeout=ClientTimeout(total=10)) as response:
+        if response.status != 200:
+            raise RuntimeError(f'HTTP {response.status}')
+        data = await response.json()
+        ip = data.get('ip')
+        if not ip:
+            raise RuntimeError('no ip in response')
+        return ip
+
+
+class ProxyIPCache:
+    """Maps proxy -> public exit IP for `ttl` seconds.
+
+    Concurrent lookups for the same proxy share one request, entries close to
+    expiry are refreshed in the background while the cached IP is still served,
+    and failed lookups are never cached. With `path` set, entries survive
+    restarts as a small JSON file.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, path: Optional[str] = None):
+        self.ttl = ttl
+        self.path = path
+        self.lookups = 0
+        self._entries: Dict[Optional[str], Tuple[str, float]] = {}
+        self._inflight: Dict[Optional[str], asyncio.Task] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self._entries = {key or None: (ip, fetched_at) for key, (ip, fetched_at) in json.load(f).items()}
+            except (OSError, ValueError):
+                self._entries = {}
+
+    async def get(self, proxy: Optional[str], lookup: Callable[[], Awaitable[str]], ttl: Optional[float] = None) -> str:
+        ttl = self.ttl if ttl is None else ttl
+        entry = self._entries.get(proxy)
+        if entry:
+            ip, fetched_at = entry
+            age = time.time() - fetched_at
+            if age < ttl:
+                if age > ttl * REFRESH_RATIO and proxy not in self._inflight:
+                    self._start_lookup(proxy, lookup).add_done_callback(lambda task: task.cancelled() or task.exception())
+                return ip
+        task = self._inflight.get(proxy) or self._start_lookup(proxy, lookup)
+        return await asyncio.shield(task)
+
+    async def refresh(self, proxy: Optional[str], lookup: Callable[[], Awaitable[str]]) -> str:
+        """Look the IP up now even if it is cached, and keep the answer for later `get()` calls."""
+        task = self._inflight.get(proxy) or self._start_lookup(proxy, lookup)
+        return await asyncio.shield(task)
+
+    def invalidate(self, proxy: Optional[str]):
+        self._entries.pop(proxy, None)
+
+    def _start_lookup(self, proxy: Optional[str], lookup: Callable[[], Awaitable[str]]) -> asyncio.Task:
+        async def run():
+            try:
+                self.lookups += 1
+                ip = await lookup()
+                self._entries[proxy] = (ip, time.time())
+                self._save()
+                return ip
+            finally:
+                self._inflight.pop(proxy, None)
+
+        task = asyncio.ensure_future(run())
+        self._inflight[proxy] = task
+        return task
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, 'w') as f:
+                json.dump({key or '': value for key, value in self._entries.items()}, f)
+        except OSError:
+            pass
+
+
+# Shared by every script in the process; set IRYS_IP_CACHE to persist it on disk
+ip_cache = ProxyIPCache(path=os.environ.get('IRYS_IP_CACHE'))
@@ -0,0 +1,109 @@
+import itertools
+import mmap
+import os
+import random
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from irys.proxies import DEFAULT_SCHEME, ProxySpec, parse_proxy
+
+# Files at least this large are read through mmap instead of buffered reads
+MMAP_THRESHOLD = 8 * 1024 * 1024
+# Items held back by shuffle_window; the order is randomised within this span
+SHUFFLE_WINDOW = 1000
+
+T = TypeVar('T')
+
+
+class KeyRecord:
+    """One pvkey.txt entry; unpacks like the old (line number, key) tuples."""
+
+    __slots__ = ('profile_num', 'private_key')
+
+    def __init__(self, profile_num: int, private_key: str):
+        self.profile_num = profile_num
+        self.private_key = private_key
+
+    def __iter__(self):
+        yield self.profile_num
+        yield self.private_key
+
+    def __repr__(self):
+        return f"KeyRecord({self.profile_num}, '0x…')"
+
+
+def _numbered(raw_lines: Iterable[bytes]) -> Iterator[Tuple[int, str]]:
+    for number, raw in enumerate(raw_lines, 1):
+        line = raw.decode('utf-8', 'replace').strip()
+        if line and not line.startswith('#'):
+            yield number, line
+
+
+def iter_lines(path: str, use_mmap: Optional[bool] = None) -> Iterator[Tuple[int, str]]:
+    """(line number, text) for every non-empty, non-comment line, read lazily."""
+    size = os.path.getsize(path)
+    if use_mmap is None:
+        use_mmap = size >= MMAP_THRESHOLD
+    with open(path, 'rb') as f:
+        if use_mmap and size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield from _numbered(iter(mapped.readline, b''))
+        else:
+            yield from _numbered(f)
+
+
+def normalize_private_key(key: str) -> Optional[str]:
+    """0x-prefixed key, or None if `key` is not 32 hex bytes."""
+    key = key if key.startswith('0x') else '0x' + key
+    try:
+        bytes.fromhex(key[2:])
+    except ValueError:
+        return None
+    return key if len(key) == 66 else None
+
+
+def iter_private_keys(path: str, on_invalid: Optional[Callable[[int, str], None]] = None,
+                      use_mmap: Optional[bool] = None) -> Iterator[KeyRecord]:
+    for number, line in iter_lines(path, use_mmap):
+        key = normalize_private_key(line)
+        if key is not None:
+            yield KeyRecord(number, key)
+        elif on_invalid is not None:
+            on_invalid(number, line)
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Consecutive lists of up to `size` items, pulled from `items` only as each list is needed."""
+    items = iter(items)
+    while True:
+        chunk = list(itertools.islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def shuffle_window(items: Iterable[T], size: int = SHUFFLE_WINDOW) -> Iterator[T]:
+    """`items` in random order while holding at most `size` of them.
+
+    Each item read replaces a random one of the window, which is handed out
+    instead, so a stream is shuffled without being read into memory first.
+    """
+    window: List[T] = []
+    for item in items:
+        if len(window) < size:
+            window.append(item)
+            continue
+        i = random.randrange(size)
+        window[i], item = item, window[i]
+        yield item
+    random.shuffle(window)
+    yield from window
+
+
+def iter_proxies(path: str, on_invalid: Optional[Callable[[int, str], None]] = None,
+                 use_mmap: Optional[bool] = None, default_scheme: str = DEFAULT_SCHEME) -> Iterator[ProxySpec]:
+    for number, line in iter_lines(path, use_mmap):
+        try:
+            yield parse_proxy(line, default_scheme)
+        except ValueError:
+            if on_invalid is not None:
+                on_invalid(number, line)
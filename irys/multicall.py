@@ -0,0 +1,93 @@
+from typing import Dict, List, Sequence, Tuple, Union
+from eth_abi import decode, encode
+from eth_utils import function_signature_to_4byte_selector, to_bytes, to_hex
+
+from irys.rpc import RPCError, batch_request, endpoint_of, rpc_request
+
+# Multicall3 is deployed at the same address on most EVM chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+AGGREGATE3_SELECTOR = function_signature_to_4byte_selector("aggregate3((address,bool,bytes)[])")
+GET_ETH_BALANCE_SELECTOR = function_signature_to_4byte_selector("getEthBalance(address)")
+MAX_CALLDATA_BYTES = 64 * 1024
+
+# (endpoint, aggregator address) -> deployed? Only definite answers are kept
+_DEPLOYED: Dict[Tuple[str, str], bool] = {}
+
+
+def _encoded_size(call_data: bytes) -> int:
+    # offset + target + allowFailure + bytes offset + bytes length + padded data
+    return 5 * 32 + (len(call_data) + 31) // 32 * 32
+
+
+def chunk_calls(calls: Sequence[Tuple[str, bytes]], max_calldata_bytes: int = MAX_CALLDATA_BYTES) -> List[List[Tuple[str, bytes]]]:
+    chunks, current, size = [], [], 4 + 64
+    for call in calls:
+        call_size = _encoded_size(call[1])
+        if current and size + call_size > max_calldata_bytes:
+            chunks.append(current)
+            current, size = [], 4 + 64
+        current.append(call)
+        size += call_size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class Multicall:
+    """Packs many read-only calls into `aggregate3` eth_calls on a Multicall3 contract.
+
+    When the aggregator is not deployed on the connected chain, or the check
+    cannot be made, `aggregate` falls back to one eth_call per entry (still
+    sent as a JSON-RPC batch).
+    """
+
+    def __init__(self, w3, address: str = MULTICALL3_ADDRESS, max_calldata_bytes: int = MAX_CALLDATA_BYTES):
+        self.url = endpoint_of(w3)
+        self.address = address
+        self.max_calldata_bytes = max_calldata_bytes
+
+    async def is_available(self) -> bool:
+        key = (self.url, self.address.lower())
+        if key not in _DEPLOYED:
+            try:
+                code = await rpc_request(self.url, "eth_getCode", [self.address, "latest"])
+            except Exception:
+                # Flaky RPC: use the per-call path this time and ask again next time
+                return False
+            if isinstance(code, RPCError):
+                return False
+            _DEPLOYED[key] = isinstance(code, str) and code not in ('0x', '0x0', '')
+        return _DEPLOYED[key]
+
+    def get_eth_balance_call(self, address: str) -> Tuple[str, bytes]:
+        return self.address, GET_ETH_BALANCE_SELECTOR + encode(['address'], [address])
+
+    async def aggregate(self, calls: Sequence[Tuple[str, bytes]]) -> List[Union[bytes, Exception, None]]:
+        """Return data of each (target, call_data) in order.
+
+        A call that reverted gives None, or its RPCError when it was sent on
+        its own; a call that could not be sent gives the transport error.
+        """
+        if not await self.is_available():
+            return await self._per_call(calls)
+
+        chunks = chunk_calls(calls, self.max_calldata_bytes)
+        requests = [
+            ("eth_call", [{"to": self.address, "data": to_hex(AGGREGATE3_SELECTOR + encode(['(address,bool,bytes)[]'], [[(target, True, data) for target, data in chunk]]))}, "latest"])
+            for chunk in chunks
+        ]
+        replies = await batch_request(self.url, requests)
+
+        results: List[Union[bytes, Exception, None]] = []
+        for chunk, reply in zip(chunks, replies):
+            if not isinstance(reply, str):
+                # The whole aggregate reverted (gas cap, node limits): retry this chunk call by call
+                results.extend(await self._per_call(chunk))
+                continue
+            (decoded,) = decode(['(bool,bytes)[]'], to_bytes(hexstr=reply))
+            results.extend(data if success else None for success, data in decoded)
+        return results
+
+    async def _per_call(self, calls: Sequence[Tuple[str, bytes]]) -> List[Union[bytes, Exception, None]]:
+        replies = await batch_request(self.url, [("eth_call", [{"to": target, "data": to_hex(data)}, "latest"]) for target, data in calls])
+        return [to_bytes(hexstr=reply) if isinstance(reply, str) else reply if isinstance(reply, Exception) else None for reply in replies]
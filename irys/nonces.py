@@ -0,0 +1,77 @@
+import heapq
+from typing import List, Optional
+from web3 import AsyncWeb3
+
+NONCE_TOO_LOW_MARKERS = ('nonce too low', 'invalid nonce', 'nonce has already been used')
+ALREADY_KNOWN_MARKERS = ('already known', 'known transaction', 'already imported')
+
+
+def is_nonce_too_low(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(marker in message for marker in NONCE_TOO_LOW_MARKERS)
+
+
+def is_already_known(error: Exception) -> bool:
+    """The node already holds this exact signed transaction, i.e. an earlier send went through."""
+    message = str(error).lower()
+    return any(marker in message for marker in ALREADY_KNOWN_MARKERS)
+
+
+class NonceManager:
+    """Hands out nonces for one account locally.
+
+    After one `sync()` against the node's pending count, `allocate()` needs no
+    RPC, so a batch of transactions can be signed and broadcast back-to-back.
+    A nonce whose transaction never left is handed back with `release()` and
+    is reused before any new one, so a failed send does not leave a hole that
+    would stall every later transaction in the mempool.
+    """
+
+    def __init__(self, w3: AsyncWeb3, address: str):
+        self.w3 = w3
+        self.address = address
+        self.next_nonce: Optional[int] = None
+        self._released: List[int] = []
+
+    async def sync(self) -> int:
+        """Realign with the node, e.g. after "nonce too low" or at start."""
+        pending = await self.w3.eth.get_transaction_count(self.address, 'pending')
+        self.next_nonce = pending
+        # Below `pending` the node holds every nonce; from it on the counter hands them out again
+        self._released = []
+        return pending
+
+    def allocate(self) -> int:
+        if self.next_nonce is None:
+            raise RuntimeError('NonceManager.sync() must be awaited before allocate()')
+        if self._released:
+            return heapq.heappop(self._released)
+        nonce = self.next_nonce
+        self.next_nonce += 1
+        return nonce
+
+    def release(self, nonce: int):
+        if self.next_nonce is None:
+            # Nothing was allocated yet, so there is nothing to hand back
+            return
+        if nonce == self.next_nonce - 1:
+            self.next_nonce = nonce
+            # Trailing released nonces collapse back into the counter
+            while self._released and max(self._released) == self.next_nonce - 1:
+                self._released.remove(self.next_nonce - 1)
+                self.next_nonce -= 1
+            heapq.heapify(self._released)
+        elif nonce < self.next_nonce:
+            heapq.heappush(self._released, nonce)
+
+    async def find_gap(self) -> Optional[int]:
+        """First nonce the node lost track of (dropped or never broadcast), or None.
+
+        The manager is resynced when a gap is found, so the next `allocate()`
+        fills it.
+        """
+        pending = await self.w3.eth.get_transaction_count(self.address, 'pending')
+        if self.next_nonce is not None and pending < self.next_nonce:
+            await self.sync()
+            return pending
+        return None
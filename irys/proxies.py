@@ -0,0 +1,92 @@
+from typing import NamedTuple, Optional, Tuple
+from aiohttp_socks import ProxyConnector, ProxyType
+
+# Scheme assumed for lines without one (host:port, host:port:user:pass, user:pass@host:port)
+DEFAULT_SCHEME = 'socks5'
+
+PROXY_TYPES = {
+    'socks5': ProxyType.SOCKS5,
+    'socks5h': ProxyType.SOCKS5,
+    'socks4': ProxyType.SOCKS4,
+    'http': ProxyType.HTTP,
+}
+
+# aiohttp_socks speaks plain text to the proxy; treating these as http would drop their TLS
+TLS_SCHEMES = ('https',)
+
+# Schemes whose proxy resolves host names itself
+REMOTE_DNS = ('socks5h',)
+
+
+class ProxySpec(NamedTuple):
+    """One proxies.txt line, parsed once at load time and shared by every request."""
+    scheme: str
+    host: str
+    port: int
+    username: Optional[str] = None
+    password: Optional[str] = None
+
+    @property
+    def url(self) -> str:
+        auth = f"{self.username}:{self.password}@" if self.username is not None else ''
+        host = f"[{self.host}]" if ':' in self.host else self.host
+        return f"{self.scheme}://{auth}{host}:{self.port}"
+
+    def connector(self, **kwargs) -> ProxyConnector:
+        """A new connector tunnelling through this proxy; every scheme goes through aiohttp_socks."""
+        return ProxyConnector(
+            proxy_type=PROXY_TYPES[self.scheme],
+            host=self.host,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            rdns=True if self.scheme in REMOTE_DNS else None,
+            **kwargs,
+        )
+
+    def __str__(self):
+        return self.url
+
+
+def _split_address(address: str, line: str) -> Tuple[str, str]:
+    """(host, port) of `host:port` or `[v6 address]:port`."""
+    if address.startswith('['):
+        host, bracket, rest = address[1:].partition(']')
+        if not bracket or not rest.startswith(':'):
+            raise ValueError(f"unrecognised proxy: {line}")
+        return host, rest[1:]
+    host, _, port = address.rpartition(':')
+    if ':' in host:
+        raise ValueError(f"unrecognised proxy (IPv6 hosts need [brackets]): {line}")
+    return host, port
+
+
+def parse_proxy(line: str, default_scheme: str = DEFAULT_SCHEME) -> ProxySpec:
+    """Parse `scheme://[user:pass@]host:port`, `user:pass@host:port`, `host:port:user:pass` or `host:port`.
+
+    Credentials end at the last `@`, so passwords may contain `@` and `:`;
+    IPv6 hosts are written `[address]:port`.
+    """
+    line = line.strip()
+    scheme, sep, rest = line.partition('://')
+    if not sep:
+        scheme, rest = default_scheme, line
+    scheme = scheme.lower()
+    credentials, at, address = rest.rstrip('/').rpartition('@')
+    username = password = None
+    if at:
+        username, colon, password = credentials.partition(':')
+        if not colon or not username:
+            raise ValueError(f"unrecognised proxy: {line}")
+    elif not sep and not address.startswith('[') and address.count(':') == 3:
+        address, username, password = address.rsplit(':', 2)
+    host, port = _split_address(address, line)
+    if scheme in TLS_SCHEMES:
+        raise ValueError(f"unsupported proxy scheme: {scheme} (TLS to the proxy is not supported; use http:// only if the proxy accepts plain text)")
+    if scheme not in PROXY_TYPES:
+        raise ValueError(f"unsupported proxy scheme: {scheme}")
+    if not host or '/' in host:
+        raise ValueError(f"unrecognised proxy: {line}")
+    if not port.isdigit() or not 0 < int(port) < 65536:
+        raise ValueError(f"invalid proxy port: {port}")
+    return ProxySpec(scheme, host, int(port), username, password)
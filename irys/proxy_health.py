@@ -0,0 +1,145 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from irys.proxies import ProxySpec
+from irys.sessions import percentile
+
+
+class ProxyStats:
+    __slots__ = ('proxy', 'latencies', 'successes', 'failures', 'streak', 'quarantines', 'quarantined_until', 'evicted', 'assigned')
+
+    def __init__(self, proxy: ProxySpec):
+        self.proxy = proxy
+        self.latencies = deque(maxlen=50)
+        self.successes = 0
+        self.failures = 0
+        self.streak = 0  # consecutive failures
+        self.quarantines = 0
+        self.quarantined_until = 0.0
+        self.evicted = False
+        self.assigned = 0
+
+
+class ProxyHealth:
+    """Scores proxies by observed latency and failures and hands out the best ones.
+
+    A proxy failing `max_failures` times in a row is quarantined for
+    `quarantine` seconds; one quarantined `max_quarantines` times is evicted
+    and only handed out again once every proxy is evicted, so `assign()`
+    returns None only for an empty proxy list. Assignments are sticky per
+    wallet while the proxy's last request succeeded; callers ask again at
+    every use, so a wallet moves off a proxy as soon as a failure has been
+    recorded on it.
+    """
+
+    def __init__(self, proxies: Iterable[ProxySpec], max_failures: int = 3, quarantine: float = 300.0, max_quarantines: int = 3):
+        self.max_failures = max_failures
+        self.quarantine = quarantine
+        self.max_quarantines = max_quarantines
+        self.started = time.monotonic()
+        self.stats: Dict[ProxySpec, ProxyStats] = {proxy: ProxyStats(proxy) for proxy in proxies}
+        self._assignments: Dict[object, ProxySpec] = {}
+
+    def record(self, proxy: Optional[ProxySpec], latency: Optional[float] = None, ok: bool = True):
+        stats = self.stats.get(proxy)
+        if stats is None:
+            return
+        if ok:
+            stats.successes += 1
+            stats.streak = 0
+            if latency is not None:
+                stats.latencies.append(latency)
+            return
+        stats.failures += 1
+        stats.streak += 1
+        if stats.streak >= self.max_failures and not self._quarantined(stats):
+            stats.streak = 0
+            stats.quarantines += 1
+            stats.quarantined_until = time.monotonic() + self.quarantine
+            stats.evicted = stats.quarantines >= self.max_quarantines
+
+    def observe(self, proxy: Optional[ProxySpec], latency: float, error: Optional[BaseException] = None):
+        """SessionPool.on_request hook: feeds every traced request into the scores."""
+        self.record(proxy, latency if error is None else None, ok=error is None)
+
+    async def check_all(self, probe: Callable[[ProxySpec], Awaitable], concurrency: int = 20):
+        """Time `probe(proxy)` for every proxy; an exception counts as a failure."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def check(proxy):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    await probe(proxy)
+                except Exception:
+                    self.record(proxy, ok=False)
+                else:
+                    self.record(proxy, time.perf_counter() - started)
+
+        await asyncio.gather(*(check(proxy) for proxy in self.stats))
+
+    def _quarantined(self, stats: ProxyStats) -> bool:
+        return stats.evicted or stats.quarantined_until > time.monotonic()
+
+    def usable(self, proxy: ProxySpec) -> bool:
+        stats = self.stats.get(proxy)
+        return stats is not None and not self._quarantined(stats)
+
+    def score(self, stats: ProxyStats) -> float:
+        """Lower is better: median latency, inflated by failure rate and current load."""
+        latency = percentile(stats.latencies, 0.5) if stats.latencies else 1.0
+        attempts = stats.successes + stats.failures
+        failure_rate = stats.failures / attempts if attempts else 0.0
+        return latency * (1 + 4 * failure_rate) * (1 + stats.assigned)
+
+    def best(self) -> Optional[ProxySpec]:
+        candidates = [stats for stats in self.stats.values() if not self._quarantined(stats)]
+        if not candidates:
+            # Everything is quarantined: fall back to the proxy that comes back first, and once every
+            # proxy is evicted to the least bad one, so a wallet is never sent out on its own IP
+            waiting = [stats for stats in self.stats.values() if not stats.evicted]
+            if waiting:
+                candidates = [min(waiting, key=lambda s: s.quarantined_until)]
+            else:
+                candidates = list(self.stats.values())
+        if not candidates:
+            return None
+        return min(candidates, key=self.score).proxy
+
+    def assign(self, key, rotate: bool = False) -> Optional[ProxySpec]:
+        """Proxy for wallet `key`; with `rotate` the current one is marked failed and replaced."""
+        current = self._assignments.get(key)
+        if current is not None:
+            if rotate:
+                self.record(current, ok=False)
+            if not rotate and self.usable(current) and not self.stats[current].streak:
+                return current
+            self.stats[current].assigned -= 1
+            del self._assignments[key]
+        proxy = self.best()
+        if proxy is not None:
+            self._assignments[key] = proxy
+            self.stats[proxy].assigned += 1
+        return proxy
+
+    def release(self, key):
+        proxy = self._assignments.pop(key, None)
+        if proxy is not None:
+            self.stats[proxy].assigned -= 1
+
+    def report(self) -> List[dict]:
+        minutes = max((time.monotonic() - self.started) / 60, 1 / 60)
+        rows = []
+        for stats in sorted(self.stats.values(), key=lambda s: -s.successes):
+            state = 'evicted' if stats.evicted else 'quarantined' if self._quarantined(stats) else 'healthy'
+            rows.append({
+                'proxy': str(stats.proxy),
+                'state': state,
+                'ok': stats.successes,
+                'failed': stats.failures,
+                'p50': percentile(stats.latencies, 0.5),
+                'per_minute': stats.successes / minutes,
+            })
+        return rows
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+from aiohttp import ClientSession, ClientTimeout
+from eth_utils import to_hex
+from web3.datastructures import AttributeDict
+
+from irys.rpc import BATCH_SIZE, RPCError, batch_request, rpc_request
+from irys.sessions import percentile
+
+QUANTITY_FIELDS = ('blockNumber', 'cumulativeGasUsed', 'effectiveGasPrice', 'gasUsed', 'status', 'transactionIndex', 'type')
+
+
+def format_receipt(raw: dict) -> AttributeDict:
+    """Decode the hex quantities of a raw eth_getTransactionReceipt result."""
+    receipt = dict(raw)
+    for field in QUANTITY_FIELDS:
+        if isinstance(receipt.get(field), str):
+            receipt[field] = int(receipt[field], 16)
+    return AttributeDict(receipt)
+
+
+class ReceiptWatcher:
+    """Waits for the receipts of every transaction a run has in flight.
+
+    A single background task polls eth_blockNumber and, once per new block
+    (or when hashes were added since the last look), asks for all pending
+    receipts in one JSON-RPC batch, resolving each waiter's future. This
+    replaces one polling loop per transaction. The task stops by itself when
+    nothing is pending.
+    """
+
+    def __init__(self, url: str, poll_interval: float = 1.0, chunk_size: int = BATCH_SIZE,
+                 session: Optional[ClientSession] = None):
+        self.url = url
+        self.poll_interval = poll_interval
+        self.chunk_size = chunk_size
+        self.polls = 0
+        self.latencies = deque(maxlen=10000)
+        self._session = session
+        self._own_session: Optional[ClientSession] = None
+        self._pending: Dict[str, Tuple[float, asyncio.Future]] = {}
+        self._waiters: Dict[str, int] = {}  # coroutines waiting on each pending hash
+        self._fresh = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def wait(self, tx_hash, timeout: Optional[float] = None) -> AttributeDict:
+        key = to_hex(tx_hash).lower()
+        if key not in self._pending:
+            self._pending[key] = (time.monotonic(), asyncio.get_running_loop().create_future())
+            self._fresh = True
+        future = self._pending[key][1]
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Transaction {key} is not in the chain after {timeout} seconds")
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+                # The last waiter timed out or was cancelled: stop polling for this hash
+                if not future.done() and self._pending.get(key, (None, None))[1] is future:
+                    self._pending.pop(key)
+
+    def _get_session(self) -> ClientSession:
+        if self._session is not None and not self._session.closed:
+            return self._session
+        if self._own_session is None or self._own_session.closed:
+            self._own_session = ClientSession(timeout=ClientTimeout(total=30))
+        return self._own_session
+
+    async def _run(self):
+        last_block = None
+        while self._pending:
+            try:
+                session = self._get_session()
+                block = await rpc_request(self.url, 'eth_blockNumber', [], session)
+                if not isinstance(block, RPCError) and (block != last_block or self._fresh):
+                    last_block, self._fresh = block, False
+                    await self._poll(session)
+            except Exception:
+                # Transient RPC trouble: keep waiting, the waiters' own timeouts still apply
+                pass
+            await asyncio.sleep(self.poll_interval)
+
+    async def _poll(self, session: ClientSession):
+        hashes = list(self._pending)
+        results = await batch_request(self.url, [('eth_getTransactionReceipt', [h]) for h in hashes], self.chunk_size, session)
+        self.polls += 1
+        now = time.monotonic()
+        for tx_hash, result in zip(hashes, results):
+            if not isinstance(result, dict):
+                continue
+            entry = self._pending.pop(tx_hash, None)
+            if entry is None:
+                continue
+            submitted, future = entry
+            self.latencies.append(now - submitted)
+            if not future.done():
+                future.set_result(format_receipt(result))
+
+    def stats(self) -> dict:
+        return {
+            'confirmed': len(self.latencies),
+            'pending': len(self._pending),
+            'polls': self.polls,
+            'p50': percentile(self.latencies, 0.50),
+            'p95': percentile(self.latencies, 0.95),
+        }
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for _, future in self._pending.values():
+            future.cancel()
+        self._pending = {}
+        self._waiters = {}
+        if self._own_session is not None:
+            await self._own_session.close()
+            self._own_session = None
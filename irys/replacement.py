@@ -0,0 +1,73 @@
+import asyncio
+import math
+import time
+from typing import Callable, Optional, Tuple
+from eth_utils import to_hex
+from web3 import AsyncWeb3
+from web3.datastructures import AttributeDict
+
+from irys.nonces import is_already_known, is_nonce_too_low
+from irys.receipts import ReceiptWatcher
+
+# Nodes only accept a replacement that raises every fee field by at least 10%
+FEE_BUMP = 1.125
+FEE_FIELDS = ('gasPrice', 'maxFeePerGas', 'maxPriorityFeePerGas')
+
+
+def bump_fees(tx: dict, factor: float = FEE_BUMP) -> dict:
+    """Copy of `tx` (same nonce) with every fee field raised by `factor`."""
+    bumped = dict(tx)
+    for field in FEE_FIELDS:
+        if bumped.get(field) is not None:
+            bumped[field] = math.ceil(bumped[field] * factor)
+    return bumped
+
+
+async def wait_or_replace(w3: AsyncWeb3, receipts: ReceiptWatcher, tx: dict, tx_hash, private_key: str,
+                          stuck_after: float, max_bumps: int, timeout: float,
+                          on_replace: Optional[Callable[[int, bytes], None]] = None) -> Tuple[AttributeDict, bytes, int]:
+    """Wait for `tx` and re-sign it with bumped fees each time it sits unmined for `stuck_after` seconds.
+
+    Every version shares the nonce, so exactly one of them can be mined; all
+    of them are watched. Returns (receipt, hash of the version that was mined,
+    number of replacements sent). Raises TimeoutError after `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    versions = {tx_hash: asyncio.create_task(receipts.wait(tx_hash, timeout))}
+    bumps = 0
+    try:
+        while True:
+            waiting = [task for task in versions.values() if not task.done()]
+            remaining = deadline - time.monotonic()
+            if not waiting or remaining <= 0:
+                raise TimeoutError(f"Transaction {to_hex(tx_hash)} is not in the chain after {timeout} seconds")
+            wait = remaining if bumps >= max_bumps else min(stuck_after, remaining)
+            done, _ = await asyncio.wait(waiting, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is None:
+                    mined = next(h for h, t in versions.items() if t is task)
+                    return task.result(), mined, bumps
+            if done or bumps >= max_bumps:
+                continue
+
+            tx = bump_fees(tx)
+            signed_tx = w3.eth.account.sign_transaction(tx, private_key)
+            try:
+                replacement = await w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            except Exception as e:
+                if is_nonce_too_low(e):
+                    # One of the versions was just mined; its receipt is on the way
+                    bumps = max_bumps
+                    continue
+                if not is_already_known(e):
+                    # e.g. "replacement transaction underpriced": bump further next round
+                    bumps += 1
+                    continue
+                replacement = signed_tx.hash
+            bumps += 1
+            versions[replacement] = asyncio.create_task(receipts.wait(replacement, deadline - time.monotonic()))
+            if on_replace is not None:
+                on_replace(bumps, replacement)
+    finally:
+        for task in versions.values():
+            task.cancel()
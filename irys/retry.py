@@ -0,0 +1,141 @@
+import asyncio
+import math
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional
+from aiohttp import ClientConnectionError, ClientResponseError, ContentTypeError
+
+NETWORK = 'network'
+TIMEOUT = 'timeout'
+RATE_LIMIT = 'rate_limit'
+SERVER = 'server'
+CLIENT = 'client'  # 4xx business errors: the same request will fail again
+TRANSIENT = 'transient'  # a 2xx answer that is not JSON, e.g. a proxy or CDN error page
+CIRCUIT_OPEN = 'circuit_open'  # refused locally by a circuit breaker
+UNKNOWN = 'unknown'
+
+RETRYABLE = (NETWORK, TIMEOUT, RATE_LIMIT, SERVER, TRANSIENT, UNKNOWN)
+
+
+def classify(error: BaseException) -> str:
+    kind = getattr(error, 'kind', None)
+    if kind is not None:
+        return kind
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return TIMEOUT
+    if isinstance(error, ContentTypeError) and error.status < 400:
+        return TRANSIENT
+    if isinstance(error, ClientResponseError):
+        if error.status == 429:
+            return RATE_LIMIT
+        if error.status >= 500:
+            return SERVER
+        return CLIENT
+    if isinstance(error, (ClientConnectionError, ConnectionError, OSError)):
+        return NETWORK
+    return UNKNOWN
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds requested by a Retry-After header (delta or HTTP date), if any."""
+    headers = getattr(error, 'headers', None)
+    value = headers.get('Retry-After') if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryBudget:
+    """Caps retries at `ratio` of recent requests (plus a small floor) for one endpoint.
+
+    When an endpoint is failing for everyone, wallets stop multiplying the
+    load with retries and fail fast instead. Both counts decay with a time
+    constant of `window` seconds, so a long healthy stretch does not bank
+    retries for the next outage.
+    """
+
+    def __init__(self, ratio: float = 0.2, floor: int = 10, window: float = 10.0):
+        self.ratio = ratio
+        self.floor = floor
+        self.window = window
+        self.requests = 0.0
+        self.retries = 0.0
+        self._updated = time.monotonic()
+
+    def _decay(self):
+        now = time.monotonic()
+        factor = math.exp(-(now - self._updated) / self.window)
+        self.requests *= factor
+        self.retries *= factor
+        self._updated = now
+
+    def record_request(self):
+        self._decay()
+        self.requests += 1
+
+    def try_spend(self) -> bool:
+        self._decay()
+        if self.retries + 1 > self.floor + self.ratio * self.requests:
+            return False
+        self.retries += 1
+        return True
+
+
+class RetryError(Exception):
+    def __init__(self, endpoint: str, attempts: int, error: BaseException):
+        super().__init__(f"{endpoint}: {classify(error)} error after {attempts} attempts - {error}")
+        self.endpoint = endpoint
+        self.attempts = attempts
+        self.error = error
+        self.kind = classify(error)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, honouring Retry-After, with a retry budget per endpoint."""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 2.0, max_delay: float = 60.0,
+                 budget_ratio: float = 0.2, budget_floor: int = 10, budget_window: float = 10.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.budget_floor = budget_floor
+        self.budget_window = budget_window
+        self.budgets: Dict[str, RetryBudget] = {}
+
+    def budget(self, endpoint: str) -> RetryBudget:
+        if endpoint not in self.budgets:
+            self.budgets[endpoint] = RetryBudget(self.budget_ratio, self.budget_floor, self.budget_window)
+        return self.budgets[endpoint]
+
+    def delay_for(self, attempt: int, error: BaseException) -> float:
+        requested = retry_after(error)
+        if requested is not None:
+            return min(requested, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def call(self, endpoint: str, request: Callable[[], Awaitable],
+                   sleep: Callable[[float], Awaitable] = asyncio.sleep,
+                   on_retry: Optional[Callable[[int, BaseException, float], None]] = None):
+        """Await `request()` until it succeeds; raises RetryError once retrying stops making sense."""
+        budget = self.budget(endpoint)
+        for attempt in range(self.max_attempts):
+            budget.record_request()
+            try:
+                return await request()
+            except Exception as e:
+                last_attempt = attempt == self.max_attempts - 1
+                if last_attempt or classify(e) not in RETRYABLE or not budget.try_spend():
+                    raise RetryError(endpoint, attempt + 1, e) from e
+                delay = self.delay_for(attempt, e)
+                if on_retry is not None:
+                    on_retry(attempt + 1, e, delay)
+                await sleep(delay)
@@ -0,0 +1,81 @@
+import asyncio
+from typing import Any, List, Optional, Sequence, Tuple
+from aiohttp import ClientSession, ClientTimeout
+
+# Maximum number of requests per JSON-RPC batch
+BATCH_SIZE = 100
+
+
+class RPCError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(f"RPC error {code}: {message}")
+        self.code = code
+        self.message = message
+
+
+def endpoint_of(w3) -> str:
+    return w3.provider.endpoint_uri
+
+
+def _result_of(reply: dict) -> Any:
+    if 'error' in reply:
+        error = reply['error'] or {}
+        return RPCError(error.get('code', -1), error.get('message', 'unknown error'))
+    return reply.get('result')
+
+
+async def _post_batch(session: ClientSession, url: str, calls: Sequence[Tuple[str, list]], first_id: int) -> List[Any]:
+    payload = [
+        {"jsonrpc": "2.0", "id": first_id + i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+    async with session.post(url, json=payload) as response:
+        response.raise_for_status()
+        body = await response.json(content_type=None)
+
+    if not isinstance(body, list):
+        # Node does not support batches: send this chunk as individual requests
+        return list(await asyncio.gather(*(rpc_request(url, method, params, session) for method, params in calls)))
+
+    replies = {reply.get('id'): reply for reply in body}
+    results = []
+    for i in range(len(calls)):
+        reply = replies.get(first_id + i)
+        results.append(_result_of(reply) if reply else RPCError(-1, 'missing reply in batch'))
+    return results
+
+
+async def rpc_request(url: str, method: str, params: list, session: Optional[ClientSession] = None) -> Any:
+    """Single JSON-RPC call; errors are returned as RPCError instead of raised."""
+    if session is None:
+        async with ClientSession(timeout=ClientTimeout(total=30)) as own_session:
+            return await rpc_request(url, method, params, own_session)
+    payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+    async with session.post(url, json=payload) as response:
+        response.raise_for_status()
+        return _result_of(await response.json(content_type=None))
+
+
+async def batch_request(url: str, calls: Sequence[Tuple[str, list]], chunk_size: int = BATCH_SIZE,
+                        session: Optional[ClientSession] = None) -> List[Any]:
+    """Send calls as chunked JSON-RPC batches.
+
+    Results keep the order of `calls`; a failed item is returned as an RPCError
+    so one bad entry does not discard the rest of the batch.
+    """
+    if session is None:
+        async with ClientSession(timeout=ClientTimeout(total=60)) as own_session:
+            return await batch_request(url, calls, chunk_size, own_session)
+
+    chunks = [calls[i:i + chunk_size] for i in range(0, len(calls), chunk_size)]
+    replies = await asyncio.gather(
+        *(_post_batch(session, url, chunk, n * chunk_size) for n, chunk in enumerate(chunks)),
+        return_exceptions=True,
+    )
+    results = []
+    for chunk, reply in zip(chunks, replies):
+        if isinstance(reply, BaseException):
+            results.extend([reply] * len(chunk))
+        else:
+            results.extend(reply)
+    return results
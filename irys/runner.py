@@ -0,0 +1,163 @@
+import asyncio
+import time
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable, List, NamedTuple, Optional, Union
+
+from irys.scheduler import Slots
+
+
+class WalletResult(NamedTuple):
+    index: int
+    item: Any
+    value: Any
+    error: Optional[BaseException]
+    elapsed: float
+
+
+class WalletRun(NamedTuple):
+    """Outcome of run_wallets: how many wallets finished, and the results of the failed ones."""
+    wallets: int
+    failures: List[WalletResult]
+
+
+class Park(NamedTuple):
+    """Returned by a handler to run `item` again after `delay` seconds without holding a worker."""
+    delay: float
+    item: Any
+
+
+# Returned by a run_sessions `start` callback to open no further sessions
+STOP = object()
+
+
+async def _iterate(items: Union[Iterable, AsyncIterable]):
+    if hasattr(items, '__aiter__'):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def run_wallets(items: Union[Iterable, AsyncIterable], handle: Callable[[int, Any], Awaitable[Any]], workers: int,
+                      queue_size: Optional[int] = None,
+                      on_result: Optional[Callable[[WalletResult], Any]] = None) -> WalletRun:
+    """Process `items` with `workers` coroutines pulling from a bounded queue.
+
+    Items are read from the iterable, sync or async, only as fast as workers
+    free up, so a long key file is never expanded into one task per wallet.
+    A handler exception is recorded on that wallet's result instead of
+    stopping the run. Only failed results are kept, in input order, so
+    memory stays flat however many wallets succeed; pass `on_result` to see
+    every result as it completes.
+    """
+    loop = asyncio.get_running_loop()
+    workers = max(1, workers)
+    queue = asyncio.Queue(maxsize=max(workers, queue_size or workers * 2))
+    failures = []
+    finished = 0
+    pending = 0
+    produced = False
+
+    def finish_one():
+        nonlocal pending, finished
+        pending -= 1
+        finished += 1
+        if produced and pending == 0:
+            for _ in range(workers):
+                queue.put_nowait(None)
+
+    async def produce():
+        nonlocal pending, produced
+        index = 0
+        async for item in _iterate(items):
+            pending += 1
+            await queue.put((index, item))
+            index += 1
+        produced = True
+        if pending == 0:
+            for _ in range(workers):
+                await queue.put(None)
+
+    async def worker():
+        while True:
+            entry = await queue.get()
+            if entry is None:
+                return
+            index, item = entry
+            started = time.perf_counter()
+            value, error = None, None
+            try:
+                value = await handle(index, item)
+            except Exception as e:
+                error = e
+            if isinstance(value, Park):
+                loop.call_later(max(0, value.delay), lambda e=(index, value.item): loop.create_task(queue.put(e)))
+                continue
+            result = WalletResult(index, item, value, error, time.perf_counter() - started)
+            if error is not None:
+                failures.append(result)
+            if on_result is not None:
+                on_result(result)
+            finish_one()
+
+    await asyncio.gather(produce(), *(worker() for _ in range(workers)))
+    return WalletRun(finished, sorted(failures, key=lambda result: result.index))
+
+
+async def run_sessions(count: int, start: Callable[[int], Awaitable[Any]], complete: Callable[[int, Any], Awaitable[Any]],
+                       max_open: Union[int, Slots] = 1, pause: Optional[Callable[[], Awaitable]] = None) -> List[Any]:
+    """Run `count` start/complete sessions of one wallet, overlapping up to `max_open` of them.
+
+    `start(i)` returns the opened session, None if it could not be opened, or
+    STOP. Each opened session is completed by `complete(i, session)` in the
+    background, so the next start (after `pause()`) is issued during the
+    completion wait of the previous ones. Pass the same Slots as `max_open`
+    to several calls to share one bound between them. Returns the completion
+    results in start order.
+    """
+    slots = max_open if isinstance(max_open, Slots) else Slots(max(1, max_open))
+    tasks = []
+    try:
+        for i in range(count):
+            await slots.acquire()
+            try:
+                session = await start(i)
+            except BaseException:
+                slots.release()
+                raise
+            if session is None or session is STOP:
+                slots.release()
+                if session is STOP:
+                    break
+                continue
+            task = asyncio.ensure_future(complete(i, session))
+            task.add_done_callback(lambda _: slots.release())
+            tasks.append(task)
+            if pause is not None and i < count - 1:
+                await pause()
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+def summarize(run: WalletRun) -> dict:
+    return {
+        'wallets': run.wallets,
+        'succeeded': run.wallets - len(run.failures),
+        'failed': len(run.failures),
+        'errors': [(result.item, str(result.error)) for result in run.failures],
+    }
+
+
+def run_report(run: WalletRun, **totals) -> dict:
+    """JSON-ready summary of a run: wallet counts, failed wallets by profile number, plus `totals`."""
+    summary = summarize(run)
+    return {
+        'wallets': summary['wallets'],
+        'succeeded': summary['succeeded'],
+        'failed': summary['failed'],
+        'errors': [{'profile': next(iter(item)), 'error': error} for item, error in summary['errors']],
+        **totals,
+    }
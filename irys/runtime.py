@@ -0,0 +1,70 @@
+import os
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple
+from web3 import AsyncWeb3
+
+from irys.balances import BalanceCache
+from irys.sessions import SessionPool
+
+
+class Runtime:
+    """Resources shared by every script run in one process.
+
+    A script run on its own closes them when it ends. The interactive menu
+    sets `persistent` and keeps one event loop alive, so later menu actions
+    reuse the connected RPC client, the warm session pools, the parsed proxy
+    file and the balance cache. Wallet addresses are already remembered per
+    process by the wallet index.
+    """
+
+    def __init__(self):
+        self.persistent = False
+        self.balances = BalanceCache()
+        self._web3: Dict[str, AsyncWeb3] = {}
+        self._session_pools: Dict[Tuple, SessionPool] = {}
+        self._files: Dict[Tuple[str, Hashable], Tuple[Tuple[int, int], Tuple[Any, ...]]] = {}
+
+    def web3(self, url: str) -> AsyncWeb3:
+        if url not in self._web3:
+            self._web3[url] = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(url))
+        return self._web3[url]
+
+    def session_pool(self, **kwargs) -> SessionPool:
+        """The pool built with these settings, shared by every run asking for the same ones."""
+        key = tuple(sorted(kwargs.items()))
+        if key not in self._session_pools:
+            self._session_pools[key] = SessionPool(**kwargs)
+        return self._session_pools[key]
+
+    def load(self, path: str, read: Callable[[], Iterable], variant: Hashable = None) -> Tuple[Any, ...]:
+        """Items of `path` as returned by `read()`, parsed again only after the file changes.
+
+        Every caller gets the same cached tuple; it is never copied. Key files
+        are streamed instead, so only small files such as proxies.txt go here.
+        Callers reading the same file differently pass their own `variant`.
+        """
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        entry = self._files.get((path, variant))
+        if entry is None or entry[0] != signature:
+            entry = (signature, tuple(read()))
+            self._files[path, variant] = entry
+        return entry[1]
+
+    async def release(self):
+        """End of a script run: drop per-run hooks and, unless persistent, close everything."""
+        for pool in self._session_pools.values():
+            pool.on_request = None
+        if not self.persistent:
+            await self.close()
+
+    async def close(self):
+        pools, self._session_pools = list(self._session_pools.values()), {}
+        for pool in pools:
+            await pool.close()
+        clients, self._web3 = list(self._web3.values()), {}
+        for w3 in clients:
+            await w3.provider.disconnect()
+
+
+# Shared by every script of the process; main.py makes it persistent for the menu
+runtime = Runtime()
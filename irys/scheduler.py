@@ -0,0 +1,121 @@
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
+
+
+class Slots:
+    """Bounded count of work in flight; waiters get freed slots in the order they asked.
+
+    `resize()` may grow or shrink the bound while work is running: growing
+    wakes waiters at once, shrinking takes effect as slots are released.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.in_flight = 0
+        self._seq = itertools.count()
+        self._waiters: List[Tuple[float, int, asyncio.Future]] = []
+
+    async def acquire(self):
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        if self.in_flight < self.capacity and not self._waiters:
+            self.in_flight += 1
+            return
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (loop.time(), next(self._seq), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot may have been handed over right before the cancellation
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        if self.in_flight <= self.capacity and self._hand_over():
+            return
+        self.in_flight -= 1
+
+    def resize(self, capacity: int):
+        self.capacity = capacity
+        while self.in_flight < self.capacity and self._hand_over():
+            self.in_flight += 1
+
+    def _hand_over(self) -> bool:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                # Hand the slot straight to the longest-waiting action
+                future.set_result(None)
+                return True
+        return False
+
+
+class Scheduler:
+    """Timer-driven pacing for many wallet coroutines on one event loop.
+
+    Pauses go through `sleep()`, which parks a future in a single timer heap
+    instead of holding a concurrency slot, so a sleeping wallet costs nothing.
+    `slot()` bounds only the work actually in flight (HTTP and RPC requests);
+    when slots are contended they are handed out in the order the actions
+    became due. Requests to an endpoint listed in `limiters` are bounded by
+    that endpoint's own limiter instead of the shared slots.
+    """
+
+    def __init__(self, max_in_flight: int, limiters: Optional[Dict[str, object]] = None):
+        self.slots = Slots(max_in_flight)
+        self.limiters = limiters or {}
+        self._seq = itertools.count()
+        self._timers: List[Tuple[float, int, asyncio.Future]] = []
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._handle_due = float('inf')
+
+    async def sleep(self, delay: float):
+        if delay <= 0:
+            await asyncio.sleep(0)
+            return
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._timers, (loop.time() + delay, next(self._seq), future))
+        self._arm(loop)
+        await future
+
+    def _arm(self, loop: asyncio.AbstractEventLoop):
+        while self._timers and self._timers[0][2].done():
+            heapq.heappop(self._timers)
+        if not self._timers:
+            return
+        due = self._timers[0][0]
+        if self._handle is not None and self._handle_due <= due:
+            return
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = loop.call_at(due, self._fire, loop)
+        self._handle_due = due
+
+    def _fire(self, loop: asyncio.AbstractEventLoop):
+        self._handle = None
+        self._handle_due = float('inf')
+        now = loop.time()
+        while self._timers and self._timers[0][0] <= now:
+            _, _, future = heapq.heappop(self._timers)
+            if not future.done():
+                future.set_result(None)
+        self._arm(loop)
+
+    @asynccontextmanager
+    async def slot(self, endpoint: Optional[str] = None):
+        limiter = self.limiters.get(endpoint)
+        if limiter is not None:
+            async with limiter.request():
+                yield
+            return
+        await self.slots.acquire()
+        try:
+            yield
+        finally:
+            self.slots.release()
@@ -0,0 +1,95 @@
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+from aiohttp import ClientSession, ClientTimeout, TCPConnector, TraceConfig
+
+from irys.proxies import ProxySpec
+
+
+def percentile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class SessionPool:
+    """One warm ClientSession per proxy, shared by every request of a run.
+
+    Connections are kept alive between games, DNS answers are cached and the
+    number of sockets per session is bounded. Call `close()` when the run ends.
+    Set `on_request(proxy, latency, error)` to observe every request per proxy.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 10, keepalive_timeout: float = 60,
+                 dns_ttl: int = 300, timeout: ClientTimeout = ClientTimeout(total=180), **connector_kwargs):
+        self.timeout = timeout
+        self.connector_kwargs = {
+            'limit': limit,
+            'limit_per_host': limit_per_host,
+            'keepalive_timeout': keepalive_timeout,
+            'ttl_dns_cache': dns_ttl,
+            **connector_kwargs,
+        }
+        self.handshakes = 0
+        self.requests = 0
+        self.latencies = deque(maxlen=10000)
+        self.on_request: Optional[Callable[[Optional[ProxySpec], float, Optional[BaseException]], None]] = None
+        self._sessions: Dict[Optional[ProxySpec], ClientSession] = {}
+
+    def _trace_config(self, proxy: Optional[ProxySpec]) -> TraceConfig:
+        trace = TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            ctx.started = time.perf_counter()
+
+        async def on_request_end(session, ctx, params):
+            latency = time.perf_counter() - ctx.started
+            self.requests += 1
+            self.latencies.append(latency)
+            if self.on_request is not None:
+                self.on_request(proxy, latency, None)
+
+        async def on_request_exception(session, ctx, params):
+            if self.on_request is not None:
+                self.on_request(proxy, time.perf_counter() - ctx.started, params.exception)
+
+        async def on_connection_create_end(session, ctx, params):
+            self.handshakes += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_exception)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        return trace
+
+    def get(self, proxy: Optional[ProxySpec] = None) -> ClientSession:
+        session = self._sessions.get(proxy)
+        if session is None or session.closed:
+            if proxy is not None:
+                connector = proxy.connector(**self.connector_kwargs)
+            else:
+                connector = TCPConnector(**self.connector_kwargs)
+            session = ClientSession(connector=connector, timeout=self.timeout, trace_configs=[self._trace_config(proxy)])
+            self._sessions[proxy] = session
+        return session
+
+    def stats(self) -> dict:
+        return {
+            'sessions': len(self._sessions),
+            'handshakes': self.handshakes,
+            'requests': self.requests,
+            'p50': percentile(self.latencies, 0.50),
+            'p95': percentile(self.latencies, 0.95),
+        }
+
+    async def close(self):
+        sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            await session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
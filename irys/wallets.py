@@ -0,0 +1,93 @@
+import os
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from eth_account import Account
+
+from irys.loader import chunked
+
+# Below this many keys a process pool costs more than it saves
+PARALLEL_THRESHOLD = 256
+# Addresses remembered per process, least recently used dropped first
+MAX_REMEMBERED = 100000
+
+_ADDRESSES: 'OrderedDict[str, Optional[str]]' = OrderedDict()
+
+
+class Wallet(NamedTuple):
+    profile_num: int
+    private_key: str
+    address: Optional[str]
+
+
+def _remember(private_key: str, address: Optional[str]):
+    _ADDRESSES[private_key] = address
+    _ADDRESSES.move_to_end(private_key)
+    while len(_ADDRESSES) > MAX_REMEMBERED:
+        _ADDRESSES.popitem(last=False)
+
+
+def _derive(private_key: str) -> Optional[str]:
+    try:
+        return Account.from_key(private_key).address
+    except Exception:
+        return None
+
+
+def _derive_chunk(private_keys: Sequence[str]) -> List[Optional[str]]:
+    return [_derive(key) for key in private_keys]
+
+
+def derive_addresses(private_keys: Sequence[str], workers: Optional[int] = None,
+                     pool: Optional[Executor] = None) -> List[Optional[str]]:
+    """Addresses for `private_keys` (None for an invalid key), across processes for large lists.
+
+    A `pool` passed in is used instead of starting one, so a caller deriving
+    chunk after chunk pays for the worker processes once.
+    """
+    workers = workers or os.cpu_count() or 1
+    if len(private_keys) < PARALLEL_THRESHOLD or workers < 2:
+        return _derive_chunk(private_keys)
+    size = -(-len(private_keys) // (workers * 4))
+    chunks = [private_keys[i:i + size] for i in range(0, len(private_keys), size)]
+    if pool is not None:
+        return [address for chunk in pool.map(_derive_chunk, chunks) for address in chunk]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [address for chunk in pool.map(_derive_chunk, chunks) for address in chunk]
+
+
+def build_wallet_index(private_keys: Sequence[Tuple[int, str]], pool: Optional[Executor] = None) -> List[Wallet]:
+    """Wallets of `private_keys`, every address derived once per process."""
+    addresses = {key: _ADDRESSES[key] for _, key in private_keys if key in _ADDRESSES}
+    missing = [key for _, key in private_keys if key not in addresses]
+    if missing:
+        addresses.update(zip(missing, derive_addresses(missing, pool=pool)))
+    for key, address in addresses.items():
+        _remember(key, address)
+    return [Wallet(profile_num, key, addresses[key]) for profile_num, key in private_keys]
+
+
+def iter_wallets(private_keys: Iterable[Tuple[int, str]], chunk_size: int = PARALLEL_THRESHOLD) -> Iterator[Wallet]:
+    """Wallets of a key stream, their addresses derived a chunk at a time as they are needed.
+
+    Only one chunk of keys is held at once, so a pvkey.txt of any size is
+    walked in flat memory. The process pool is started on the first chunk
+    that needs one and shared by every later chunk of the stream.
+    """
+    workers = os.cpu_count() or 1
+    pool = None
+    try:
+        for chunk in chunked(private_keys, chunk_size):
+            if pool is None and workers >= 2 and sum(key not in _ADDRESSES for _, key in chunk) >= PARALLEL_THRESHOLD:
+                pool = ProcessPoolExecutor(max_workers=workers)
+            yield from build_wallet_index(chunk, pool)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def address_of(private_key: str) -> Optional[str]:
+    """Address of one key, from the index when it was built, else derived and remembered."""
+    if private_key not in _ADDRESSES:
+        _remember(private_key, _derive(private_key))
+    return _ADDRESSES[private_key]
@@ -1,5 +1,9 @@
 import os
 import sys
+import json
+import argparse
+import contextlib
+import time
 import asyncio
 from colorama import init, Fore, Style
 import inquirer
@@ -68,35 +72,41 @@ async def run_nftcollection(language: str):
     from scripts.nftcollection import run_nftcollection as nftcollection_run
     await nftcollection_run(language)
 
-async def run_deposit(language: str):
+async def run_deposit(language: str, **options):
     from scripts.deposit import run_deposit as deposit_run
-    await deposit_run(language)
+    return await deposit_run(language, **options)
 
-async def run_withdraw(language: str):
+async def run_withdraw(language: str, **options):
     from scripts.withdraw import run_withdraw as withdraw_run
-    await withdraw_run(language)
+    return await withdraw_run(language, **options)
 
-async def run_spritetype(language: str):
+async def run_spritetype(language: str, **options):
     from scripts.spritetype import run_spritetype as spritetype_run
-    await spritetype_run(language)
+    return await spritetype_run(language, **options)
 
-async def run_snake(language: str):
+async def run_snake(language: str, **options):
     from scripts.snake import run_snake as snake_run
-    await snake_run(language)
+    return await snake_run(language, **options)
 
-async def run_asteroids(language: str):
+async def run_asteroids(language: str, **options):
     from scripts.asteroids import run_asteroids as asteroids_run
-    await asteroids_run(language)
+    return await asteroids_run(language, **options)
 
-async def run_hexshot(language: str):
+async def run_hexshot(language: str, **options):
     from scripts.hexshot import run_hexshot as hexshot_run
-    await hexshot_run(language)
+    return await hexshot_run(language, **options)
 
-async def run_missile(language: str):
+async def run_missile(language: str, **options):
     from scripts.missile import run_missile as missile_run
-    await missile_run(language)
+    return await missile_run(language, **options)
+
+async def run_arcade(language: str, **options):
+    from scripts.arcade import run_arcade as arcade_run
+    return await arcade_run(language, **options)
     
 async def cmd_exit(language: str):
+    from irys.runtime import runtime
+    await runtime.close()
     print_border(f"Exiting...", Fore.GREEN)
     sys.exit(0)
 
@@ -114,6 +124,7 @@ SCRIPT_MAP = {
     "asteroids": run_asteroids,
     "hexshot": run_hexshot,
     "missile": run_missile,
+    "arcade": run_arcade,
     "exit": cmd_exit
 }
 
@@ -129,12 +140,13 @@ def get_available_scripts(language):
             {"name": "6. Tự động chơi game Asteroids │ Irys Testnet", "value": "asteroids"},
             {"name": "7. Tự động chơi game Hexshot │ Irys Testnet", "value": "hexshot"},
             {"name": "8. Tự động chơi game Missile │ Irys Testnet", "value": "missile"},
+            {"name": "9. Tự động chơi nhiều game Arcade cùng lúc │ Irys Testnet", "value": "arcade"},
 
           
-            {"name": "9. Deploy NFT - Quản lý bộ sưu tập NFT [ Tạo | Mint | Đốt ] | Irys Testnet", "value": "nftcollection"},
-            {"name": "10. Send TX ngẫu nhiên hoặc File (address.txt) | Irys Testnet", "value": "sendtx"},
-            {"name": "11. Deploy Token smart-contract | Irys Testnet", "value": "deploytoken"},
-            {"name": "12. Send Token ERC20 ngẫu nhiên hoặc File (addressERC20.txt) | Irys Testnet", "value": "sendtoken"},
+            {"name": "10. Deploy NFT - Quản lý bộ sưu tập NFT [ Tạo | Mint | Đốt ] | Irys Testnet", "value": "nftcollection"},
+            {"name": "11. Send TX ngẫu nhiên hoặc File (address.txt) | Irys Testnet", "value": "sendtx"},
+            {"name": "12. Deploy Token smart-contract | Irys Testnet", "value": "deploytoken"},
+            {"name": "13. Send Token ERC20 ngẫu nhiên hoặc File (addressERC20.txt) | Irys Testnet", "value": "sendtoken"},
 
             {"name": "X. Exit", "value": "exit"},
             
@@ -149,25 +161,222 @@ def get_available_scripts(language):
             {"name": "6. Automatically play Asteroids │ Irys Testnet", "value": "asteroids"},
             {"name": "7. Automatically play Hexshot │ Irys Testnet", "value": "hexshot"},
             {"name": "8. Automatically play Missile │ Irys Testnet", "value": "missile"},
+            {"name": "9. Automatically play several Arcade games at once │ Irys Testnet", "value": "arcade"},
             
 
-            {"name": "9. Deploy NFT - Manage NFT Collection [ Create | Mint | Burn ] | Irys Testnet", "value": "nftcollection"},
-            {"name": "10. Send Random TX or File (address.txt) | Irys Testnet", "value": "sendtx"},
-            {"name": "11. Deploy Token smart-contract | Irys Testnet", "value": "deploytoken"},
-            {"name": "12. Send Token ERC20 Random or File (addressERC20.txt) | Irys Testnet", "value": "sendtoken"},
+            {"name": "10. Deploy NFT - Manage NFT Collection [ Create | Mint | Burn ] | Irys Testnet", "value": "nftcollection"},
+            {"name": "11. Send Random TX or File (address.txt) | Irys Testnet", "value": "sendtx"},
+            {"name": "12. Deploy Token smart-contract | Irys Testnet", "value": "deploytoken"},
+            {"name": "13. Send Token ERC20 Random or File (addressERC20.txt) | Irys Testnet", "value": "sendtoken"},
 
             {"name": "X. Exit", "value": "exit"},
         ]
     }
     return scripts[language]
 
+# Một event loop dùng chung cho mọi lựa chọn menu, để RPC, session và dữ liệu ví luôn sẵn sàng
+_loop = None
+
+def get_loop():
+    global _loop
+    if _loop is None:
+        from irys.runtime import runtime
+        runtime.persistent = True
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
 def run_script(script_func, language):
     """Chạy script bất kể nó là async hay không."""
     if asyncio.iscoroutinefunction(script_func):
-        asyncio.run(script_func(language))
+        get_loop().run_until_complete(script_func(language))
     else:
         script_func(language)
 
+# Chế độ không tương tác: python main.py run <script> [tùy chọn] | python main.py job <jobs.json>
+EXIT_OK = 0
+EXIT_FAILED = 1  # một ví hoặc lượt chạy bị lỗi, hoặc script dừng giữa chừng
+EXIT_USAGE = 2  # tham số hoặc file job không hợp lệ
+
+# Tùy chọn CLI / job -> tham số của script
+JOB_OPTIONS = {
+    'games': 'games',
+    'amount': 'amount',
+    'times': 'times',
+    'concurrency': 'workers',
+    'keys': 'keys_file',
+    'proxies': 'proxies_file',
+}
+COMMON_OPTIONS = ('concurrency', 'keys', 'proxies', 'language')
+LANGUAGES = ('vi', 'en')
+
+# Script chạy được không cần hỏi, và các tùy chọn bắt buộc thay cho input()
+HEADLESS_SCRIPTS = {
+    'deposit': ('amount', 'times'),
+    'withdraw': ('amount', 'times'),
+    'spritetype': ('games',),
+    'snake': ('games',),
+    'asteroids': ('games',),
+    'hexshot': ('games',),
+    'missile': ('games',),
+    'arcade': ('games',),
+}
+
+class UsageError(Exception):
+    """Tham số hoặc job không hợp lệ: trả về EXIT_USAGE mà không chạy script."""
+
+def parse_count(value, name: str, minimum: int = 1) -> int:
+    if isinstance(value, bool) or not str(value).strip().isdigit() or int(value) < minimum:
+        raise UsageError(f"{name} must be an integer >= {minimum}: {value!r}")
+    return int(value)
+
+def parse_amount(value, name: str) -> float:
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        amount = 0
+    if isinstance(value, bool) or not amount > 0:
+        raise UsageError(f"{name} must be a positive number: {value!r}")
+    return amount
+
+def parse_games(value, script: str):
+    """`10` (số lượt mỗi loại game) hoặc `snake=5,asteroids=3` (danh mục cho arcade)."""
+    if not isinstance(value, dict):
+        if str(value).strip().isdigit() or isinstance(value, int):
+            return parse_count(value, 'games')
+        portfolio = {}
+        for part in str(value).split(','):
+            name, _, count = part.partition('=')
+            portfolio[name.strip()] = count
+        value = portfolio
+    if script != 'arcade':
+        raise UsageError('name=count portfolios are only accepted by arcade')
+    from scripts.arcade import GAMES
+    unknown = [name for name in value if name not in GAMES]
+    if unknown:
+        raise UsageError(f"unknown game(s): {', '.join(unknown)}; choose from {', '.join(GAMES)}")
+    portfolio = {name: parse_count(count, f"games of {name}", minimum=0) for name, count in value.items()}
+    if not sum(portfolio.values()):
+        raise UsageError('the portfolio plays no games')
+    return portfolio
+
+def validate_job(job: dict):
+    """(ngôn ngữ, tham số của script) của một job; UsageError trước khi chạy bất cứ thứ gì."""
+    script = job.get('script')
+    required = HEADLESS_SCRIPTS.get(script)
+    if required is None:
+        raise UsageError(f"not runnable headless: {script}; choose from {', '.join(HEADLESS_SCRIPTS)}")
+    unknown = set(job) - {'script'} - set(required) - set(COMMON_OPTIONS)
+    if unknown:
+        raise UsageError(f"unsupported options: {', '.join(sorted(unknown))}")
+    missing = [key for key in required if job.get(key) is None]
+    if missing:
+        raise UsageError(f"missing options: {', '.join(missing)}")
+    language = job.get('language', 'en')
+    if language not in LANGUAGES:
+        raise UsageError(f"unsupported language: {language}; choose from {', '.join(LANGUAGES)}")
+    # Script tự tạo file mẫu khi thiếu file; ở chế độ không tương tác đó là lỗi tham số
+    for key, default in (('keys', 'pvkey.txt'), ('proxies', None)):
+        path = job.get(key, default)
+        if path is not None and not (isinstance(path, str) and os.path.isfile(path)):
+            raise UsageError(f"{key} file not found: {path}")
+
+    parsers = {
+        'games': lambda value: parse_games(value, script),
+        'amount': lambda value: parse_amount(value, 'amount'),
+        'times': lambda value: parse_count(value, 'times'),
+        'concurrency': lambda value: parse_count(value, 'concurrency'),
+    }
+    options = {}
+    for key, value in job.items():
+        if key in JOB_OPTIONS and value is not None:
+            options[JOB_OPTIONS[key]] = parsers[key](value) if key in parsers else value
+    return language, options
+
+def run_job(job: dict) -> dict:
+    """Chạy một job không tương tác; trả về kết quả dạng JSON kèm exit code."""
+    result = {'script': job.get('script'), 'status': 'error', 'exit_code': EXIT_USAGE}
+    try:
+        language, options = validate_job(job)
+    except UsageError as e:
+        result['error'] = str(e)
+        return result
+
+    started = time.time()
+    try:
+        report = get_loop().run_until_complete(SCRIPT_MAP[job['script']](language, **options))
+    except SystemExit as e:
+        # Script tự dừng (thiếu pvkey.txt, không kết nối được RPC...)
+        result.update(status='failed', exit_code=EXIT_FAILED, error=f"script exited with code {e.code}")
+        return result
+    except Exception as e:
+        result.update(status='failed', exit_code=EXIT_FAILED, error=str(e))
+        return result
+    finally:
+        result['elapsed'] = time.time() - started
+
+    if report is None:
+        result.update(status='failed', exit_code=EXIT_FAILED, error='no wallets were processed')
+        return result
+    ok = not report['failed'] and report['successful'] == report['total']
+    result.update(report, status='ok' if ok else 'partial', exit_code=EXIT_OK if ok else EXIT_FAILED)
+    return result
+
+def load_jobs(path: str) -> list:
+    """File job: một object, một danh sách object, hoặc {"jobs": [...]}."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    jobs = data.get('jobs', [data]) if isinstance(data, dict) else data
+    if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+        raise ValueError(f"{path}: expected a job object, a list of jobs or {{\"jobs\": [...]}}")
+    return jobs
+
+def parse_cli(argv):
+    parser = argparse.ArgumentParser(prog='main.py', description='Irys Testnet - headless mode (no argument opens the menu)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run one script without prompts')
+    run.add_argument('script', choices=list(HEADLESS_SCRIPTS))
+    run.add_argument('--games', help='games per wallet, or name=count,... for arcade')
+    run.add_argument('--amount', type=float, help='IRYS per deposit / withdraw')
+    run.add_argument('--times', type=int, help='deposits / withdraws per wallet')
+    run.add_argument('--concurrency', type=int, help='wallets processed at the same time')
+    run.add_argument('--keys', help='private key file (default pvkey.txt)')
+    run.add_argument('--proxies', help='proxy file (default proxies.txt)')
+    run.add_argument('--language', choices=['vi', 'en'], default='en')
+    run.add_argument('--summary', help='also write the JSON summary to this file')
+
+    job = commands.add_parser('job', help='run the jobs of a JSON file in order')
+    job.add_argument('file')
+    job.add_argument('--summary', help='also write the JSON summary to this file')
+    return parser.parse_args(argv)
+
+def run_cli(argv) -> int:
+    args = parse_cli(argv)
+    if args.command == 'run':
+        jobs = [{key: value for key, value in vars(args).items() if key not in ('command', 'summary') and value is not None}]
+    else:
+        try:
+            jobs = load_jobs(args.file)
+        except (OSError, ValueError) as e:
+            print(json.dumps({'jobs': [], 'exit_code': EXIT_USAGE, 'error': str(e)}))
+            return EXIT_USAGE
+
+    from irys.runtime import runtime
+    # Log của script ra stderr, để stdout chỉ còn bản tóm tắt JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            results = [run_job(job) for job in jobs]
+        finally:
+            get_loop().run_until_complete(runtime.close())
+    exit_code = max((result['exit_code'] for result in results), default=EXIT_OK)
+    summary = json.dumps({'jobs': results, 'exit_code': exit_code}, default=str)
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            f.write(summary)
+    print(summary)
+    return exit_code
+
 def select_language():
     while True:
         _clear()
@@ -266,6 +475,8 @@ def main():
             input(f"{Fore.YELLOW}⏎ {messages[language]['press_enter']}{Style.RESET_ALL:^76}")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
     main()
 
 
@@ -0,0 +1,63 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import ClientConnectionError
+
+from irys import balances
+from irys.balances import BalanceReader
+
+BANK = '0x' + '22' * 20
+ADDRESSES = ['0x' + f'{i + 1:040x}' for i in range(5)]
+ONE_ETHER = '0x' + f'{10 ** 18:064x}'
+
+
+class NoMulticall:
+    async def is_available(self):
+        return False
+
+
+def make_reader(**kwargs):
+    w3 = SimpleNamespace(provider=SimpleNamespace(endpoint_uri='http://rpc.test/'))
+    return BalanceReader(w3, BANK, multicall=NoMulticall(), **kwargs)
+
+
+def test_concurrent_reads_share_one_batch(monkeypatch):
+    batches = []
+
+    async def batch_request(url, calls, *args):
+        batches.append(calls)
+        return [ONE_ETHER for _ in calls]
+
+    monkeypatch.setattr(balances, 'batch_request', batch_request)
+
+    async def main():
+        reader = make_reader()
+        return await asyncio.gather(*(reader.native(a) for a in ADDRESSES), *(reader.arcade(a) for a in ADDRESSES))
+
+    assert asyncio.run(main()) == [1.0] * 10
+    assert len(batches) == 1 and len(batches[0]) == 10
+
+
+def test_transport_failure_raises_inside_the_slot(monkeypatch):
+    seen = []
+
+    async def batch_request(url, calls, *args):
+        return [ClientConnectionError('reset') for _ in calls]
+
+    class Slot:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, kind, error, traceback):
+            seen.append(error)
+
+    monkeypatch.setattr(balances, 'batch_request', batch_request)
+
+    async def main():
+        reader = make_reader(slot=Slot)
+        await reader.arcade(ADDRESSES[0])
+
+    with pytest.raises(ClientConnectionError):
+        asyncio.run(main())
+    assert isinstance(seen[0], ClientConnectionError)
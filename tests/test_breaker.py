@@ -0,0 +1,98 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import ClientResponseError
+
+from irys import breaker
+from irys.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+REQUEST = SimpleNamespace(real_url='https://example.test/api')
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(breaker, 'time', SimpleNamespace(monotonic=lambda: now[0], time=lambda: now[0]))
+    return now
+
+
+async def send(circuit, error=None, sleep=None):
+    try:
+        async with circuit.guard(sleep):
+            if error is not None:
+                raise error
+    except Exception as e:
+        return e
+
+
+def trip(circuit):
+    for _ in range(circuit.failure_threshold):
+        asyncio.run(send(circuit, ConnectionError()))
+
+
+def test_opens_after_consecutive_failures(clock):
+    circuit = CircuitBreaker('api', failure_threshold=3, reset_timeout=30)
+    asyncio.run(send(circuit, ConnectionError()))
+    asyncio.run(send(circuit))
+    asyncio.run(send(circuit, ConnectionError()))
+    assert circuit.state == CLOSED
+    trip(circuit)
+    assert circuit.state == OPEN
+    assert isinstance(asyncio.run(send(circuit)), CircuitOpenError)
+
+
+def test_client_errors_do_not_count(clock):
+    circuit = CircuitBreaker('api', failure_threshold=2)
+    for _ in range(5):
+        asyncio.run(send(circuit, ClientResponseError(REQUEST, (), status=404)))
+    assert circuit.state == CLOSED
+
+
+def test_half_open_probe_closes_or_reopens(clock):
+    circuit = CircuitBreaker('api', failure_threshold=1, reset_timeout=30)
+    trip(circuit)
+    clock[0] += 30
+    asyncio.run(send(circuit, ConnectionError()))
+    assert circuit.state == OPEN and circuit.retry_in() == 30
+    clock[0] += 30
+    assert asyncio.run(send(circuit)) is None
+    assert circuit.state == CLOSED
+    assert [new for _, _, new in circuit.transitions] == [OPEN, HALF_OPEN, OPEN, HALF_OPEN, CLOSED]
+
+
+def test_only_one_probe_at_a_time(clock):
+    circuit = CircuitBreaker('api', failure_threshold=1, reset_timeout=30)
+    trip(circuit)
+    clock[0] += 30
+    circuit.before_request()
+    assert circuit.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        circuit.before_request()
+
+
+def test_guard_with_sleep_waits_out_an_open_circuit(clock):
+    circuit = CircuitBreaker('api', failure_threshold=1, reset_timeout=30)
+    trip(circuit)
+    waits = []
+
+    async def sleep(delay):
+        waits.append(delay)
+        clock[0] += delay
+
+    assert asyncio.run(send(circuit, sleep=sleep)) is None
+    assert waits == [30] and circuit.state == CLOSED
+
+
+def test_cancelled_probe_frees_the_half_open_slot(clock):
+    circuit = CircuitBreaker('api', failure_threshold=1, reset_timeout=30)
+    trip(circuit)
+    clock[0] += 30
+
+    async def cancelled():
+        async with circuit.guard():
+            raise asyncio.CancelledError()
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancelled())
+    assert asyncio.run(send(circuit)) is None
@@ -0,0 +1,81 @@
+import asyncio
+from types import SimpleNamespace
+
+from aiohttp import ClientResponseError
+
+from irys.concurrency import AIMDLimiter, is_failure, is_overload
+
+REQUEST = SimpleNamespace(real_url='https://example.test/api')
+
+
+def response_error(status):
+    return ClientResponseError(REQUEST, (), status=status)
+
+
+def test_overload_and_failure_kinds():
+    assert is_overload(response_error(429)) and is_overload(asyncio.TimeoutError())
+    assert not is_overload(response_error(404))
+    assert is_failure(ConnectionError()) and not is_failure(response_error(400))
+
+
+def test_limit_grows_after_a_healthy_window():
+    limiter = AIMDLimiter('rpc', 4, max_limit=8, target_latency=1.0, window=10)
+    for _ in range(10):
+        limiter.record(0.1)
+    assert limiter.limit == 5
+    for _ in range(50):
+        limiter.record(0.1)
+    assert limiter.limit == 8
+
+
+def test_slow_window_shrinks_the_limit():
+    limiter = AIMDLimiter('rpc', 8, target_latency=1.0, window=10)
+    for _ in range(10):
+        limiter.record(2.0)
+    assert limiter.limit == 4 and limiter.decreases == 1
+
+
+def test_client_errors_do_not_shrink_the_limit():
+    limiter = AIMDLimiter('rpc', 4, max_limit=8, max_error_rate=0.05, window=10)
+    for _ in range(10):
+        limiter.record(0.1, response_error(400))
+    assert limiter.limit == 5 and limiter.decreases == 0
+
+
+def test_overload_cuts_at_once_but_once_per_half_window():
+    limiter = AIMDLimiter('rpc', 16, window=10)
+    for _ in range(5):
+        limiter.record(0.1)
+    limiter.record(0.1, response_error(503))
+    assert limiter.limit == 8
+    for _ in range(4):
+        limiter.record(0.1, response_error(503))
+    assert limiter.limit == 8
+    limiter.record(0.1, response_error(503))
+    assert limiter.limit == 4
+
+
+def test_limit_never_drops_below_the_floor():
+    limiter = AIMDLimiter('rpc', 2, min_limit=2, window=2)
+    for _ in range(10):
+        limiter.record(0.1, response_error(503))
+    assert limiter.limit == 2
+
+
+def test_request_bounds_concurrency_and_records_outcome():
+    async def main():
+        limiter = AIMDLimiter('rpc', 2, window=100)
+        active, peak = [0], [0]
+
+        async def call():
+            async with limiter.request():
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+                await asyncio.sleep(0.01)
+                active[0] -= 1
+
+        await asyncio.gather(*(call() for _ in range(6)))
+        return limiter, peak[0]
+
+    limiter, peak = asyncio.run(main())
+    assert peak == 2 and limiter.requests == 6
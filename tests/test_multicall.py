@@ -0,0 +1,98 @@
+import asyncio
+from types import SimpleNamespace
+
+from eth_abi import decode, encode
+from eth_utils import to_bytes, to_hex
+
+from irys import multicall
+from irys.multicall import AGGREGATE3_SELECTOR, MAX_CALLDATA_BYTES, Multicall, chunk_calls
+from irys.rpc import RPCError
+
+URL = 'http://rpc.test/'
+TARGET = '0x' + '11' * 20
+FAILING = b'\xde\xad'
+
+
+def make_w3(url=URL):
+    return SimpleNamespace(provider=SimpleNamespace(endpoint_uri=url))
+
+
+def fake_aggregator(calls):
+    """Answer aggregate3 eth_calls like Multicall3: echo each call's data, fail the FAILING ones."""
+    replies = []
+    for method, params in calls:
+        data = to_bytes(hexstr=params[0]['data'])
+        assert method == 'eth_call' and data[:4] == AGGREGATE3_SELECTOR
+        (entries,) = decode(['(address,bool,bytes)[]'], data[4:])
+        results = [(call_data != FAILING, call_data) for _, _, call_data in entries]
+        replies.append(to_hex(encode(['(bool,bytes)[]'], [results])))
+    return replies
+
+
+def test_chunk_calls_respects_calldata_limit_and_order():
+    calls = [(TARGET, bytes([i % 256]) * 100) for i in range(1000)]
+    chunks = chunk_calls(calls, 4096)
+    assert len(chunks) > 1
+    assert [call for chunk in chunks for call in chunk] == calls
+    for chunk in chunks:
+        encoded = AGGREGATE3_SELECTOR + encode(['(address,bool,bytes)[]'], [[(target, True, data) for target, data in chunk]])
+        assert len(encoded) <= 4096
+
+
+def test_chunk_calls_keeps_small_lists_in_one_call():
+    calls = [(TARGET, b'\x01' * 36)] * 10
+    assert chunk_calls(calls, MAX_CALLDATA_BYTES) == [calls]
+
+
+def test_aggregate_round_trip(monkeypatch):
+    sent = []
+
+    async def batch_request(url, calls, *args):
+        sent.append(calls)
+        return fake_aggregator(calls)
+
+    monkeypatch.setattr(multicall, 'batch_request', batch_request)
+    mc = Multicall(make_w3(), max_calldata_bytes=2048)
+    monkeypatch.setattr(mc, 'is_available', lambda: asyncio.sleep(0, True))
+    calls = [(TARGET, i.to_bytes(36, 'big')) for i in range(50)] + [(TARGET, FAILING)]
+
+    results = asyncio.run(mc.aggregate(calls))
+
+    assert len(sent[0]) > 1  # split across several aggregate3 calls
+    assert results[:-1] == [data for _, data in calls[:-1]]
+    assert results[-1] is None
+
+
+def test_is_available_does_not_cache_failures(monkeypatch):
+    replies = [ConnectionError('reset'), RPCError(-32000, 'busy'), '0x6080']
+
+    async def rpc_request(url, method, params, *args):
+        reply = replies.pop(0)
+        if isinstance(reply, ConnectionError):
+            raise reply
+        return reply
+
+    monkeypatch.setattr(multicall, 'rpc_request', rpc_request)
+    monkeypatch.setattr(multicall, '_DEPLOYED', {})
+    mc = Multicall(make_w3())
+
+    assert asyncio.run(mc.is_available()) is False
+    assert asyncio.run(mc.is_available()) is False
+    assert asyncio.run(mc.is_available()) is True
+    assert not replies
+
+
+def test_aggregate_falls_back_to_per_call_when_unavailable(monkeypatch):
+    async def rpc_request(url, method, params, *args):
+        raise ConnectionError('reset')
+
+    async def batch_request(url, calls, *args):
+        return ['0x' + '00' * 31 + '07' for _ in calls]
+
+    monkeypatch.setattr(multicall, 'rpc_request', rpc_request)
+    monkeypatch.setattr(multicall, 'batch_request', batch_request)
+    monkeypatch.setattr(multicall, '_DEPLOYED', {})
+
+    results = asyncio.run(Multicall(make_w3()).aggregate([(TARGET, b'\x01')] * 3))
+
+    assert results == [b'\x00' * 31 + b'\x07'] * 3
@@ -0,0 +1,100 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from irys.nonces import NonceManager, is_already_known, is_nonce_too_low
+
+ADDRESS = '0x' + '33' * 20
+
+
+class FakeEth:
+    def __init__(self, pending):
+        self.pending = pending
+        self.calls = 0
+
+    async def get_transaction_count(self, address, block):
+        assert (address, block) == (ADDRESS, 'pending')
+        self.calls += 1
+        return self.pending
+
+
+def make_manager(pending=5):
+    eth = FakeEth(pending)
+    return NonceManager(SimpleNamespace(eth=eth), ADDRESS), eth
+
+
+def test_allocate_counts_up_from_the_pending_nonce_without_rpc():
+    nonces, eth = make_manager(5)
+    asyncio.run(nonces.sync())
+
+    assert [nonces.allocate() for _ in range(3)] == [5, 6, 7]
+    assert eth.calls == 1
+
+
+def test_allocate_before_sync_raises():
+    nonces, _ = make_manager()
+    with pytest.raises(RuntimeError):
+        nonces.allocate()
+
+
+def test_release_before_sync_is_ignored():
+    nonces, _ = make_manager(5)
+    nonces.release(3)
+    asyncio.run(nonces.sync())
+
+    assert nonces.allocate() == 5
+
+
+def test_released_nonces_are_reused_lowest_first():
+    nonces, _ = make_manager(0)
+    asyncio.run(nonces.sync())
+    for _ in range(4):
+        nonces.allocate()
+    nonces.release(2)
+    nonces.release(0)
+
+    assert [nonces.allocate() for _ in range(3)] == [0, 2, 4]
+
+
+def test_trailing_releases_collapse_into_the_counter():
+    nonces, _ = make_manager(0)
+    asyncio.run(nonces.sync())
+    for _ in range(3):
+        nonces.allocate()
+    nonces.release(1)
+    nonces.release(2)
+
+    assert nonces.next_nonce == 1
+    assert nonces.allocate() == 1
+
+
+def test_sync_drops_released_nonces_the_node_already_used():
+    nonces, eth = make_manager(0)
+    asyncio.run(nonces.sync())
+    for _ in range(3):
+        nonces.allocate()
+    nonces.release(0)
+    eth.pending = 3
+    asyncio.run(nonces.sync())
+
+    assert nonces.allocate() == 3
+
+
+def test_find_gap_reports_and_resyncs():
+    nonces, eth = make_manager(0)
+    asyncio.run(nonces.sync())
+    for _ in range(3):
+        nonces.allocate()
+
+    eth.pending = 3
+    assert asyncio.run(nonces.find_gap()) is None
+    eth.pending = 1
+    assert asyncio.run(nonces.find_gap()) == 1
+    assert nonces.allocate() == 1
+
+
+def test_error_markers():
+    assert is_nonce_too_low(ValueError("{'message': 'nonce too low'}"))
+    assert is_already_known(ValueError('already known'))
+    assert not is_already_known(ValueError('insufficient funds'))
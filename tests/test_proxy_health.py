@@ -0,0 +1,56 @@
+from irys.proxies import parse_proxy
+from irys.proxy_health import ProxyHealth
+
+FAST = parse_proxy('10.0.0.1:1080')
+SLOW = parse_proxy('10.0.0.2:1080')
+
+
+def fail(health, proxy, times):
+    for _ in range(times):
+        health.record(proxy, ok=False)
+
+
+def test_assign_prefers_the_faster_proxy_and_sticks():
+    health = ProxyHealth([FAST, SLOW])
+    health.record(FAST, 0.1)
+    health.record(SLOW, 0.15)
+    assert health.assign('a') == FAST
+    assert health.assign('a') == FAST
+    # FAST's load now outweighs its speed
+    assert health.assign('b') == SLOW
+
+
+def test_failure_moves_the_wallet_to_another_proxy():
+    health = ProxyHealth([FAST, SLOW])
+    health.record(FAST, 0.1)
+    health.record(SLOW, 0.5)
+    assert health.assign('a') == FAST
+    fail(health, FAST, 3)
+    assert health.assign('a') == SLOW
+
+
+def test_quarantined_proxies_fall_back_to_the_first_to_return():
+    health = ProxyHealth([FAST, SLOW], max_failures=1, quarantine=60)
+    fail(health, SLOW, 1)
+    fail(health, FAST, 1)
+    assert health.assign('a') == SLOW
+
+
+def test_evicted_proxies_still_beat_no_proxy():
+    health = ProxyHealth([FAST, SLOW], max_failures=1, quarantine=0, max_quarantines=1)
+    health.record(FAST, 0.1)
+    fail(health, FAST, 1)
+    fail(health, SLOW, 3)
+    assert all(stats.evicted for stats in health.stats.values())
+    assert health.assign('a') == FAST
+
+
+def test_no_proxies_assigns_none():
+    assert ProxyHealth([]).assign('a') is None
+
+
+def test_release_frees_the_assignment():
+    health = ProxyHealth([FAST])
+    health.assign('a')
+    health.release('a')
+    assert health.stats[FAST].assigned == 0
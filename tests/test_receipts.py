@@ -0,0 +1,133 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from eth_utils import to_hex
+
+from irys import receipts
+from irys.receipts import ReceiptWatcher
+from irys.replacement import bump_fees, wait_or_replace
+
+SESSION = SimpleNamespace(closed=False)
+FIRST = b'\x01' * 32
+SECOND = b'\x02' * 32
+
+
+class FakeChain:
+    """Answers eth_blockNumber and batched eth_getTransactionReceipt for the `mined` hashes."""
+
+    def __init__(self, monkeypatch):
+        self.block = 1
+        self.mined = set()
+        self.batches = []
+        monkeypatch.setattr(receipts, 'rpc_request', self.rpc_request)
+        monkeypatch.setattr(receipts, 'batch_request', self.batch_request)
+
+    def mine(self, tx_hash):
+        self.mined.add(to_hex(tx_hash))
+        self.block += 1
+
+    async def rpc_request(self, url, method, params, *args):
+        assert method == 'eth_blockNumber'
+        return hex(self.block)
+
+    async def batch_request(self, url, calls, *args):
+        self.batches.append([params[0] for _, params in calls])
+        return [{'transactionHash': params[0], 'status': '0x1', 'gasUsed': '0x5208'} if params[0] in self.mined else None
+                for _, params in calls]
+
+
+def make_watcher():
+    return ReceiptWatcher('http://rpc.test/', poll_interval=0.01, session=SESSION)
+
+
+def test_pending_receipts_share_one_batch(monkeypatch):
+    chain = FakeChain(monkeypatch)
+    chain.mine(FIRST)
+    chain.mine(SECOND)
+
+    async def main():
+        watcher = make_watcher()
+        return await asyncio.gather(watcher.wait(FIRST, 1), watcher.wait(SECOND, 1))
+
+    first, second = asyncio.run(main())
+    assert (first.status, second.gasUsed) == (1, 21000)
+    assert chain.batches == [[to_hex(FIRST), to_hex(SECOND)]]
+
+
+def test_timed_out_waiter_keeps_the_hash_for_other_waiters(monkeypatch):
+    chain = FakeChain(monkeypatch)
+
+    async def main():
+        watcher = make_watcher()
+        patient = asyncio.create_task(watcher.wait(FIRST, 2))
+        with pytest.raises(TimeoutError):
+            await watcher.wait(FIRST, 0.05)
+        chain.mine(FIRST)
+        return await patient
+
+    assert asyncio.run(main()).status == 1
+
+
+def test_last_waiter_leaving_stops_polling_for_the_hash(monkeypatch):
+    FakeChain(monkeypatch)
+
+    async def main():
+        watcher = make_watcher()
+        with pytest.raises(TimeoutError):
+            await watcher.wait(FIRST, 0.05)
+        return watcher.stats()['pending']
+
+    assert asyncio.run(main()) == 0
+
+
+class FakeEth:
+    def __init__(self, chain, mine_replacement=True, send_error=None):
+        self.chain = chain
+        self.mine_replacement = mine_replacement
+        self.send_error = send_error
+        self.sent = []
+        self.account = SimpleNamespace(sign_transaction=self.sign_transaction)
+
+    def sign_transaction(self, tx, private_key):
+        tx_hash = bytes([len(self.sent) + 2]) * 32
+        return SimpleNamespace(raw_transaction=tx, hash=tx_hash)
+
+    async def send_raw_transaction(self, raw):
+        if self.send_error is not None:
+            self.chain.mine(FIRST)
+            raise self.send_error
+        self.sent.append(raw)
+        tx_hash = bytes([len(self.sent) + 1]) * 32
+        if self.mine_replacement:
+            self.chain.mine(tx_hash)
+        return tx_hash
+
+
+def test_bump_fees_raises_every_fee_field():
+    tx = {'nonce': 3, 'maxFeePerGas': 100, 'maxPriorityFeePerGas': 10}
+    assert bump_fees(tx) == {'nonce': 3, 'maxFeePerGas': 113, 'maxPriorityFeePerGas': 12}
+
+
+def test_stuck_transaction_is_replaced_and_the_replacement_mined(monkeypatch):
+    chain = FakeChain(monkeypatch)
+    eth = FakeEth(chain)
+    tx = {'nonce': 3, 'gasPrice': 100}
+
+    async def main():
+        return await wait_or_replace(SimpleNamespace(eth=eth), make_watcher(), tx, FIRST, '0xkey', 0.05, 2, 2)
+
+    receipt, mined, bumps = asyncio.run(main())
+    assert (mined, bumps) == (SECOND, 1)
+    assert eth.sent == [{'nonce': 3, 'gasPrice': 113}]
+
+
+def test_nonce_too_low_on_replacement_waits_for_the_original(monkeypatch):
+    chain = FakeChain(monkeypatch)
+    eth = FakeEth(chain, send_error=ValueError('nonce too low'))
+
+    async def main():
+        return await wait_or_replace(SimpleNamespace(eth=eth), make_watcher(), {'nonce': 3, 'gasPrice': 100}, FIRST, '0xkey', 0.05, 2, 2)
+
+    receipt, mined, bumps = asyncio.run(main())
+    assert mined == FIRST and not eth.sent
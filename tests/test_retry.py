@@ -0,0 +1,113 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import ClientConnectionError, ClientResponseError, ContentTypeError
+
+from irys import retry
+from irys.retry import (CLIENT, NETWORK, RATE_LIMIT, SERVER, TIMEOUT, TRANSIENT, UNKNOWN, RetryBudget, RetryError,
+                        RetryPolicy, classify, retry_after)
+
+REQUEST = SimpleNamespace(real_url='https://example.test/api')
+
+
+def response_error(status, cls=ClientResponseError, **kwargs):
+    return cls(REQUEST, (), status=status, **kwargs)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(retry, 'time', SimpleNamespace(monotonic=lambda: now[0], time=lambda: now[0]))
+    return now
+
+
+def test_budget_allows_floor_plus_ratio_of_requests(clock):
+    budget = RetryBudget(ratio=0.2, floor=2)
+    for _ in range(10):
+        budget.record_request()
+    assert sum(budget.try_spend() for _ in range(10)) == 4
+
+
+def test_budget_forgets_old_healthy_traffic(clock):
+    budget = RetryBudget(ratio=0.2, floor=10, window=10)
+    for _ in range(5000):
+        budget.record_request()
+    clock[0] += 120
+    budget.record_request()
+    assert sum(budget.try_spend() for _ in range(100)) == 10
+
+
+def test_budget_refills_after_an_outage(clock):
+    budget = RetryBudget(ratio=0.2, floor=10, window=10)
+    assert sum(budget.try_spend() for _ in range(20)) == 10
+    clock[0] += 120
+    assert budget.try_spend()
+
+
+@pytest.mark.parametrize('error, kind', [
+    (asyncio.TimeoutError(), TIMEOUT),
+    (response_error(429), RATE_LIMIT),
+    (response_error(503), SERVER),
+    (response_error(400), CLIENT),
+    (response_error(200, ContentTypeError, message='text/html'), TRANSIENT),
+    (response_error(502, ContentTypeError, message='text/html'), SERVER),
+    (ClientConnectionError(), NETWORK),
+    (ValueError('bad'), UNKNOWN),
+])
+def test_classify(error, kind):
+    assert classify(error) == kind
+
+
+def test_retry_after_reads_delta_seconds():
+    assert retry_after(response_error(429, headers={'Retry-After': '3'})) == 3.0
+    assert retry_after(response_error(429)) is None
+
+
+def run_policy(policy, errors, endpoint='api'):
+    """Call `policy` with a request failing with `errors` in turn, then succeeding."""
+    calls, sleeps = [], []
+
+    async def request():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return 'ok'
+
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    async def main():
+        try:
+            return await policy.call(endpoint, request, sleep)
+        except RetryError as e:
+            return e
+
+    return asyncio.run(main()), len(calls), sleeps
+
+
+def test_policy_retries_transient_errors_until_success():
+    result, calls, sleeps = run_policy(RetryPolicy(3, base_delay=1), [response_error(503), asyncio.TimeoutError()])
+    assert (result, calls, len(sleeps)) == ('ok', 3, 2)
+
+
+def test_policy_honours_retry_after():
+    result, _, sleeps = run_policy(RetryPolicy(3), [response_error(429, headers={'Retry-After': '7'})])
+    assert result == 'ok' and sleeps == [7.0]
+
+
+def test_policy_does_not_retry_client_errors():
+    error, calls, _ = run_policy(RetryPolicy(3), [response_error(400)])
+    assert isinstance(error, RetryError) and (error.kind, error.attempts, calls) == (CLIENT, 1, 1)
+
+
+def test_policy_gives_up_after_max_attempts():
+    error, calls, _ = run_policy(RetryPolicy(2, base_delay=0), [response_error(503)] * 5)
+    assert isinstance(error, RetryError) and (error.kind, calls) == (SERVER, 2)
+
+
+def test_policy_stops_retrying_once_the_budget_is_spent(clock):
+    policy = RetryPolicy(3, base_delay=0, budget_ratio=0, budget_floor=1)
+    assert run_policy(policy, [response_error(503)])[0] == 'ok'
+    error, calls, _ = run_policy(policy, [response_error(503)])
+    assert isinstance(error, RetryError) and calls == 1
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from irys.runner import STOP, Park, WalletRun, run_report, run_sessions, run_wallets, summarize
+
+
+def test_run_wallets_keeps_only_failures():
+    async def handle(index, item):
+        if item[0] % 3 == 0:
+            raise ValueError(f"wallet {item[0]}")
+        return item[0]
+
+    seen = []
+    run = asyncio.run(run_wallets(((n, 'key') for n in range(1, 10)), handle, 2, on_result=seen.append))
+    assert run.wallets == 9
+    assert [result.item[0] for result in run.failures] == [3, 6, 9]
+    assert sorted(result.value for result in seen if result.error is None) == [1, 2, 4, 5, 7, 8]
+
+
+def test_run_wallets_reads_async_items():
+    async def items():
+        for n in range(5):
+            yield (n,)
+
+    async def handle(index, item):
+        return index
+
+    assert asyncio.run(run_wallets(items(), handle, 3)).wallets == 5
+
+
+def test_run_wallets_parked_items_free_their_worker():
+    visits = []
+
+    async def handle(index, item):
+        visits.append((index, item))
+        if item == 'first':
+            return Park(0.05, 'again')
+        return item
+
+    async def main():
+        seen = []
+        run = await run_wallets(['first', 'second', 'third'], handle, 1, on_result=seen.append)
+        return run, seen
+
+    run, seen = asyncio.run(main())
+    assert visits == [(0, 'first'), (1, 'second'), (2, 'third'), (0, 'again')]
+    assert run == WalletRun(3, []) and [result.value for result in seen] == ['second', 'third', 'again']
+
+
+def test_run_wallets_with_no_items():
+    async def handle(index, item):
+        raise AssertionError('no items to handle')
+
+    assert asyncio.run(run_wallets([], handle, 4)) == WalletRun(0, [])
+
+
+def test_run_report_lists_failed_profiles():
+    async def handle(index, item):
+        if item[0] == 2:
+            raise RuntimeError('boom')
+
+    run = asyncio.run(run_wallets([(1, 'a'), (2, 'b')], handle, 2))
+    assert summarize(run)['succeeded'] == 1
+    assert run_report(run, total=4) == {'wallets': 2, 'succeeded': 1, 'failed': 1,
+                                        'errors': [{'profile': 2, 'error': 'boom'}], 'total': 4}
+
+
+def test_run_sessions_overlaps_up_to_max_open():
+    open_now, peak, pauses = [0], [0], []
+
+    async def start(i):
+        open_now[0] += 1
+        peak[0] = max(peak[0], open_now[0])
+        return i
+
+    async def complete(i, session):
+        await asyncio.sleep(0.01)
+        open_now[0] -= 1
+        return session * 10
+
+    async def pause():
+        pauses.append(1)
+
+    results = asyncio.run(run_sessions(5, start, complete, 2, pause))
+    assert results == [0, 10, 20, 30, 40]
+    assert peak[0] == 2 and len(pauses) == 4
+
+
+def test_run_sessions_skips_failed_starts_and_stops():
+    async def start(i):
+        return {1: None, 3: STOP}.get(i, i)
+
+    async def complete(i, session):
+        return session
+
+    assert asyncio.run(run_sessions(6, start, complete, 1)) == [0, 2]
+
+
+def test_run_sessions_cancels_open_sessions_when_a_start_fails():
+    completed = []
+
+    async def start(i):
+        if i == 1:
+            raise RuntimeError('start failed')
+        return i
+
+    async def complete(i, session):
+        await asyncio.sleep(1)
+        completed.append(i)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run_sessions(3, start, complete, 2))
+    assert completed == []
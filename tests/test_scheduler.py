@@ -0,0 +1,78 @@
+import asyncio
+
+from irys.scheduler import Scheduler, Slots
+
+
+async def holders(slots, count):
+    """Start `count` tasks that take a slot and keep it until released; returns them and the grant order."""
+    granted = []
+
+    async def hold(i):
+        await slots.acquire()
+        granted.append(i)
+
+    tasks = [asyncio.ensure_future(hold(i)) for i in range(count)]
+    await asyncio.sleep(0)
+    return tasks, granted
+
+
+def test_slots_bound_and_hand_over_in_order():
+    async def main():
+        slots = Slots(2)
+        tasks, granted = await holders(slots, 5)
+        assert granted == [0, 1] and slots.in_flight == 2
+        slots.release()
+        slots.release()
+        await asyncio.sleep(0)
+        assert granted == [0, 1, 2, 3] and slots.in_flight == 2
+        tasks[4].cancel()
+
+    asyncio.run(main())
+
+
+def test_slots_resize_grows_at_once_and_shrinks_on_release():
+    async def main():
+        slots = Slots(1)
+        tasks, granted = await holders(slots, 4)
+        slots.resize(3)
+        await asyncio.sleep(0)
+        assert granted == [0, 1, 2] and slots.in_flight == 3
+        slots.resize(1)
+        slots.release()
+        slots.release()
+        await asyncio.sleep(0)
+        assert granted == [0, 1, 2] and slots.in_flight == 1
+        slots.release()
+        await asyncio.sleep(0)
+        assert granted == [0, 1, 2, 3]
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_does_not_take_a_slot():
+    async def main():
+        slots = Slots(1)
+        tasks, granted = await holders(slots, 3)
+        tasks[1].cancel()
+        await asyncio.sleep(0)
+        slots.release()
+        await asyncio.sleep(0)
+        assert granted == [0, 2] and slots.in_flight == 1
+
+    asyncio.run(main())
+
+
+def test_scheduler_sleeps_wake_in_due_order():
+    async def main():
+        scheduler = Scheduler(1)
+        woke = []
+
+        async def nap(name, delay):
+            await scheduler.sleep(delay)
+            woke.append(name)
+
+        await asyncio.gather(nap('late', 0.03), nap('early', 0.01), nap('now', 0))
+        return woke
+
+    assert asyncio.run(main()) == ['now', 'early', 'late']
@@ -0,0 +1,28 @@
+from scripts import spritetype
+from scripts.spritetype import SubmissionQuota
+
+
+def test_limit_learned_early_in_the_run_stays_with_its_wallet():
+    quota = SubmissionQuota(window=3600)
+    quota.record('A')
+    quota.limit_reached('A')
+    quota.record('B')
+
+    assert quota.is_exhausted('A')
+    assert not quota.is_exhausted('B')
+
+
+def test_limit_learned_from_a_whole_window_applies_to_every_wallet(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(spritetype.time, 'time', lambda: now[0])
+    quota = SubmissionQuota(window=100)
+    now[0] = 1150.0
+    for _ in range(3):
+        quota.record('A')
+    quota.limit_reached('A')
+    for _ in range(2):
+        quota.record('B')
+
+    assert not quota.is_exhausted('B')
+    quota.record('B')
+    assert quota.is_exhausted('B')
@@ -0,0 +1,34 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from eth_account import Account
+
+from irys import wallets
+from irys.wallets import PARALLEL_THRESHOLD, address_of, iter_wallets
+
+KEYS = [(i + 1, '0x' + f'{i + 1:064x}') for i in range(PARALLEL_THRESHOLD * 3)]
+
+
+def test_iter_wallets_derives_in_order_and_starts_one_pool(monkeypatch):
+    pools = []
+
+    class Pool(ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(wallets, 'ProcessPoolExecutor', Pool)
+    monkeypatch.setattr(wallets.os, 'cpu_count', lambda: 4)
+    monkeypatch.setattr(wallets, '_ADDRESSES', wallets.OrderedDict())
+
+    result = list(iter_wallets(iter(KEYS)))
+
+    assert [(w.profile_num, w.private_key) for w in result] == KEYS
+    assert result[0].address == Account.from_key(KEYS[0][1]).address
+    assert len(pools) == 1 and pools[0]._shutdown
+
+
+def test_address_of_remembers_and_rejects_invalid_keys(monkeypatch):
+    monkeypatch.setattr(wallets, '_ADDRESSES', wallets.OrderedDict())
+    assert address_of(KEYS[1][1]) == Account.from_key(KEYS[1][1]).address
+    assert address_of('0x1234') is None
+    assert len(wallets._ADDRESSES) == 2